@@ -15,7 +15,7 @@ from typing import Dict, Any, List, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from .websocket_manager import WebSocketManager
 
-from .mcp_tools import TOOL_DEFINITIONS, MCPToolExecutor
+from .mcp_tools import TOOL_DEFINITIONS, TOOL_DEFINITIONS_BY_NAME, MCPToolExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -54,9 +54,7 @@ class WebContainerMCPServer:
         self._executor = MCPToolExecutor(ws_manager, session_id)
 
         # Tool registry
-        self._tools: Dict[str, Dict[str, Any]] = {
-            tool["name"]: tool for tool in TOOL_DEFINITIONS
-        }
+        self._tools: Dict[str, Dict[str, Any]] = TOOL_DEFINITIONS_BY_NAME
 
         logger.info(
             f"WebContainerMCPServer initialized: "
@@ -907,6 +907,9 @@ Returns:
     },
 ]
 
+# Same definitions keyed by tool name, built once for O(1) lookup
+TOOL_DEFINITIONS_BY_NAME = {tool["name"]: tool for tool in TOOL_DEFINITIONS}
+
 
 # ============================================
 # Tool Executor Class
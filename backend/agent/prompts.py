@@ -4,7 +4,7 @@ Nexting Agent Prompts
 System prompt for Claude Agent SDK with BoxLite/WebContainer MCP tools.
 """
 
-from typing import List, Dict, Any
+from typing import Iterable, List, Dict, Any
 
 # ============================================
 # Main System Prompt
@@ -250,7 +250,7 @@ def build_context_prompt(webcontainer_state: dict, selected_source_id: str = Non
     if files:
         parts.append("### Project Files")
         parts.append("```")
-        tree = _build_file_tree(list(files.keys()))
+        tree = _build_file_tree(files.keys())
         parts.extend(tree[:30])  # Limit to 30 lines
         parts.append("```")
         if len(files) > 20:
@@ -272,7 +272,7 @@ def build_context_prompt(webcontainer_state: dict, selected_source_id: str = Non
     return "\n".join(parts)
 
 
-def _build_file_tree(paths: List[str]) -> List[str]:
+def _build_file_tree(paths: Iterable[str]) -> List[str]:
     """Build a simple tree view of file paths."""
     tree: Dict[str, Any] = {}
 
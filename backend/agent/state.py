@@ -7,7 +7,7 @@ from dataclasses import dataclass
 from typing import Optional, Any, Dict, List
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     """Result from tool execution"""
     success: bool
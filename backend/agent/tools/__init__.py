@@ -32,6 +32,8 @@ from .tool_registry import (
     TOOL_PRIORITIES,
 
     # Tool getters
+    ToolMeta,
+    resolve_tool,
     get_all_tool_definitions as get_registry_tool_definitions,
     get_tool_by_name,
     is_tool_concurrency_safe,
@@ -124,6 +126,7 @@ from .subagent_tools import (
 from .webcontainer_tools_v2 import (
     # Core V2 Tools
     shell,
+    shell_batch,
     write_file as v2_write_file,
     read_file as v2_read_file,
     edit_file as v2_edit_file,
@@ -147,24 +150,29 @@ from .webcontainer_tools_v2 import (
 )
 
 # Unified ALL_TOOLS including JSON source tools, code generation tools, error handling tools, preview diagnostic tools, terminal/preview readers, and legacy SubAgent tools
-ALL_TOOLS = {
-    **REGISTRY_ALL_TOOLS,
-    **JSON_SOURCE_TOOLS,
-    **CODE_GENERATION_TOOLS,
-    **ERROR_HANDLING_TOOLS,
-    **PREVIEW_DIAGNOSTIC_TOOLS,
-    **TERMINAL_PREVIEW_READER_TOOLS,
-    **SUBAGENT_TOOLS,
-}
+ALL_TOOLS = dict(REGISTRY_ALL_TOOLS)
+for _registry in (
+    JSON_SOURCE_TOOLS,
+    CODE_GENERATION_TOOLS,
+    ERROR_HANDLING_TOOLS,
+    PREVIEW_DIAGNOSTIC_TOOLS,
+    TERMINAL_PREVIEW_READER_TOOLS,
+    SUBAGENT_TOOLS,
+):
+    ALL_TOOLS.update(_registry)
+del _registry
 
 # Legacy STATE_QUERY_TOOLS and ACTION_TOOLS (for backward compatibility)
 STATE_QUERY_TOOLS = {**_WEBCONTAINER_STATE_TOOLS, **JSON_SOURCE_TOOLS, **CODE_GENERATION_TOOLS, **ERROR_HANDLING_TOOLS, **PREVIEW_DIAGNOSTIC_TOOLS, **TERMINAL_PREVIEW_READER_TOOLS}
 ACTION_TOOLS = _WEBCONTAINER_ACTION_TOOLS
 
+# The tool set is fixed at import, so get_all_tools() can share one tuple
+_ALL_TOOLS_TUPLE = tuple(ALL_TOOLS.values())
+
 
 def get_all_tools():
-    """Get list of all tool functions"""
-    return list(ALL_TOOLS.values())
+    """Get all tool functions (a shared tuple; copy it before modifying)"""
+    return _ALL_TOOLS_TUPLE
 
 
 def get_tool_definitions(use_v2: bool = False):
@@ -210,6 +218,7 @@ def get_simplified_tools():
 
     This is a convenience function that returns only the core tools:
     - shell: Execute any command
+    - shell_batch: Execute several commands as one action
     - write_file: Create/overwrite files
     - read_file: Read file content
     - edit_file: Search and replace
@@ -253,6 +262,8 @@ __all__ = [
     # Tool Utility Functions
     "get_all_tools",
     "get_tool_definitions",
+    "ToolMeta",
+    "resolve_tool",
     "get_tool_by_name",
     "is_tool_concurrency_safe",
     "get_tool_priority",
@@ -297,6 +308,7 @@ __all__ = [
     "V2_STATE_TOOLS",
     "V2_ACTION_TOOLS",
     "shell",
+    "shell_batch",
     "v2_write_file",
     "v2_read_file",
     "v2_edit_file",
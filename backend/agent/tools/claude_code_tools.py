@@ -14,12 +14,12 @@ Claude Code Style Tools
 
 from __future__ import annotations
 import re
-import fnmatch
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 
 from .webcontainer_tools import (
     ToolResult,
+    _compile_glob,
     list_files,
     get_project_structure,
     search_in_file,
@@ -75,6 +75,7 @@ def glob(
         base_path = "/" + base_path
 
     # Match files against pattern
+    glob_match = _compile_glob(pattern)
     matched_files = []
 
     for file_path in files.keys():
@@ -96,7 +97,7 @@ def glob(
             relative = normalized.lstrip("/")
 
         # Match against glob pattern
-        if fnmatch.fnmatch(relative, pattern) or fnmatch.fnmatch(normalized, pattern):
+        if glob_match(relative) or glob_match(normalized):
             matched_files.append(normalized)
 
             if len(matched_files) >= max_results:
@@ -23,7 +23,7 @@ logger = logging.getLogger(__name__)
 # Tool Result Type
 # ============================================
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     """Result from tool execution"""
     success: bool
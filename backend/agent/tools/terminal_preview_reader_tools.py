@@ -12,7 +12,9 @@ Tools:
 
 from __future__ import annotations
 from typing import Any, Optional, List, Dict
+from collections import OrderedDict
 from dataclasses import dataclass
+import io
 import os
 import logging
 
@@ -23,7 +25,7 @@ logger = logging.getLogger(__name__)
 # Tool Result Type
 # ============================================
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     """Result from tool execution"""
     success: bool
@@ -37,10 +39,52 @@ class ToolResult:
         return f"Error: {self.result}"
 
 
+class _LineBuffer:
+    """
+    Line-oriented report builder backed by io.StringIO.
+
+    getvalue() is equivalent to "\n".join(lines) over the lines written
+    with ln(), without keeping an intermediate list of strings alive.
+    """
+
+    __slots__ = ("_write", "_io", "_empty")
+
+    def __init__(self):
+        self._io = io.StringIO()
+        self._write = self._io.write
+        self._empty = True
+
+    def ln(self, text: str = "") -> None:
+        if self._empty:
+            self._empty = False
+        else:
+            self._write("\n")
+        self._write(text)
+
+    def getvalue(self) -> str:
+        return self._io.getvalue()
+
+
 # ============================================
 # Terminal Reading Tools
 # ============================================
 
+def _iter_terminal_tail(terminal: dict, limit: int):
+    """
+    Yield the last `limit` history entries followed by the last `limit`
+    last_output lines of a terminal, without building a combined list.
+    """
+    for entry in terminal.get("history", [])[-limit:]:
+        if isinstance(entry, dict):
+            yield entry.get("data", "")
+        else:
+            yield str(entry)
+
+    last_output = terminal.get("last_output")
+    if last_output:
+        yield from last_output[-limit:]
+
+
 def get_all_terminals_output(
     webcontainer_state: Optional[dict] = None,
     max_lines_per_terminal: int = 100,
@@ -198,69 +242,71 @@ def get_preview_error_overlay(
     plugin = error_overlay.get("plugin", "")
     frame = error_overlay.get("frame", "")
 
-    lines = ["## 🔴 Preview Error Overlay (What User Sees)\n"]
+    buf = _LineBuffer()
+    buf.ln("## 🔴 Preview Error Overlay (What User Sees)\n")
 
     # Plugin info
     if plugin:
-        lines.append(f"**Plugin**: `{plugin}`\n")
+        buf.ln(f"**Plugin**: `{plugin}`\n")
 
     # Main error message
-    lines.append("### Error Message\n")
-    lines.append("```")
-    lines.append(message)
-    lines.append("```\n")
+    buf.ln("### Error Message\n")
+    buf.ln("```")
+    buf.ln(message)
+    buf.ln("```\n")
 
     # Code frame (shows the problematic code)
     if frame:
-        lines.append("### Code Location\n")
-        lines.append("```")
-        lines.append(frame)
-        lines.append("```\n")
+        buf.ln("### Code Location\n")
+        buf.ln("```")
+        buf.ln(frame)
+        buf.ln("```\n")
 
     # Stack trace
     if stack:
-        lines.append("### Stack Trace\n")
-        lines.append("```")
-        # Show first 15 lines of stack trace
-        stack_lines = stack.split("\n")
+        buf.ln("### Stack Trace\n")
+        buf.ln("```")
+        # Show first 15 lines of stack trace (only split what is shown;
+        # the 16th element, if any, is the unsplit remainder)
+        stack_lines = stack.split("\n", 15)
         for line in stack_lines[:15]:
             if line.strip():
-                lines.append(line)
-        total_stack_lines = len(stack_lines)
+                buf.ln(line)
+        total_stack_lines = stack.count("\n") + 1
         if total_stack_lines > 15:
             remaining = total_stack_lines - 15
-            lines.append(f"... ({remaining} more lines)")
-        lines.append("```\n")
+            buf.ln(f"... ({remaining} more lines)")
+        buf.ln("```\n")
 
     # Extract file path and line number
-    lines.append("---\n")
-    lines.append("### 🎯 Quick Analysis\n")
+    buf.ln("---\n")
+    buf.ln("### 🎯 Quick Analysis\n")
 
     if "Failed to resolve import" in message or "Cannot find module" in message:
-        lines.append("**Error Type**: Missing Import")
-        lines.append("**Cause**: A file is importing something that doesn't exist")
-        lines.append("\n**Fix Strategy**:")
-        lines.append("1. Check which file/module is missing")
-        lines.append("2. Either create the file OR remove the import")
-        lines.append("3. Call verify_changes() to confirm fix")
+        buf.ln("**Error Type**: Missing Import")
+        buf.ln("**Cause**: A file is importing something that doesn't exist")
+        buf.ln("\n**Fix Strategy**:")
+        buf.ln("1. Check which file/module is missing")
+        buf.ln("2. Either create the file OR remove the import")
+        buf.ln("3. Call verify_changes() to confirm fix")
     elif "SyntaxError" in message:
-        lines.append("**Error Type**: Syntax Error")
-        lines.append("**Cause**: Invalid JavaScript/JSX syntax")
-        lines.append("\n**Fix Strategy**:")
-        lines.append("1. Read the file mentioned in error")
-        lines.append("2. Check line number shown above")
-        lines.append("3. Fix syntax error (missing bracket, comma, etc.)")
+        buf.ln("**Error Type**: Syntax Error")
+        buf.ln("**Cause**: Invalid JavaScript/JSX syntax")
+        buf.ln("\n**Fix Strategy**:")
+        buf.ln("1. Read the file mentioned in error")
+        buf.ln("2. Check line number shown above")
+        buf.ln("3. Fix syntax error (missing bracket, comma, etc.)")
     else:
-        lines.append("**Error Type**: Build Error")
-        lines.append("**Cause**: Vite cannot compile the code")
-        lines.append("\n**Fix Strategy**:")
-        lines.append("1. Read error message carefully")
-        lines.append("2. Fix the mentioned file")
-        lines.append("3. Call verify_changes() to confirm")
+        buf.ln("**Error Type**: Build Error")
+        buf.ln("**Cause**: Vite cannot compile the code")
+        buf.ln("\n**Fix Strategy**:")
+        buf.ln("1. Read error message carefully")
+        buf.ln("2. Fix the mentioned file")
+        buf.ln("3. Call verify_changes() to confirm")
 
     return ToolResult(
         success=True,
-        result="\n".join(lines)
+        result=buf.getvalue()
     )
 
 
@@ -268,6 +314,58 @@ def get_preview_error_overlay(
 # Comprehensive Snapshot Tool
 # ============================================
 
+# Small LRU of rendered snapshots keyed by a fingerprint of the sub-state
+# the snapshot reads. Each entry also holds the fingerprinted objects so
+# their id() values cannot be recycled while the entry is alive.
+_SNAPSHOT_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+_SNAPSHOT_CACHE_SIZE = 8
+_EMPTY_DICT: dict = {}
+
+
+def _join_args_bounded(args: list, limit: int) -> str:
+    """
+    Equivalent to " ".join(str(a) for a in args)[:limit], but stops
+    stringifying args once `limit` characters have been produced.
+    """
+    parts = []
+    total = 0
+    for arg in args:
+        text = str(arg)
+        parts.append(text)
+        total += len(text) + 1
+        if total > limit:
+            break
+    return " ".join(parts)[:limit]
+
+
+def _snapshot_fingerprint(webcontainer_state: dict) -> tuple:
+    """
+    Cheap fingerprint of the preview/terminal state used by the snapshot.
+
+    Returns (key, refs) where refs are the objects whose id() is in key.
+    """
+    # Defaults are shared constants so a missing key fingerprints stably
+    preview = webcontainer_state.get("preview") or _EMPTY_DICT
+    error_overlay = preview.get("error_overlay")
+    console_messages = preview.get("console_messages") or ()
+    last_console = console_messages[-1] if console_messages else None
+    terminals = webcontainer_state.get("terminals") or ()
+
+    refs = [preview, error_overlay, console_messages, last_console, terminals]
+    key = [id(preview), id(error_overlay), id(console_messages),
+           len(console_messages), id(last_console), id(terminals)]
+
+    for terminal in terminals:
+        history = terminal.get("history") or ()
+        last_output = terminal.get("last_output") or ()
+        last_entry = history[-1] if history else None
+        refs.extend((terminal, history, last_output, last_entry))
+        key.extend((id(terminal), id(history), len(history), id(last_entry),
+                    id(last_output), len(last_output)))
+
+    return tuple(key), refs
+
+
 def get_comprehensive_error_snapshot(
     webcontainer_state: Optional[dict] = None,
     **kwargs
@@ -305,72 +403,78 @@ def get_comprehensive_error_snapshot(
             result="WebContainer state not available"
         )
 
-    lines = ["## 📸 Comprehensive Error Snapshot\n"]
-    lines.append("*All error sources in one view*\n")
-    lines.append("=" * 60)
-    lines.append("\n")
+    key, refs = _snapshot_fingerprint(webcontainer_state)
+    cached = _SNAPSHOT_CACHE.get(key)
+    if cached is not None:
+        _SNAPSHOT_CACHE.move_to_end(key)
+        return ToolResult(success=True, result=cached[1])
+
+    result = _render_error_snapshot(webcontainer_state)
+
+    _SNAPSHOT_CACHE[key] = (refs, result)
+    if len(_SNAPSHOT_CACHE) > _SNAPSHOT_CACHE_SIZE:
+        _SNAPSHOT_CACHE.popitem(last=False)
+
+    return ToolResult(success=True, result=result)
+
+
+def _render_error_snapshot(webcontainer_state: dict) -> str:
+    """Render the comprehensive error snapshot report."""
+    buf = _LineBuffer()
+    buf.ln("## 📸 Comprehensive Error Snapshot\n")
+    buf.ln("*All error sources in one view*\n")
+    buf.ln("=" * 60)
+    buf.ln("\n")
 
     issues_found = 0
 
     # 1. Preview Error Overlay
-    lines.append("## 1️⃣ Preview Error Overlay\n")
+    buf.ln("## 1️⃣ Preview Error Overlay\n")
     preview = webcontainer_state.get("preview", {})
     error_overlay = preview.get("error_overlay")
 
     if error_overlay:
         issues_found += 1
         message = error_overlay.get("message", "Unknown error")
-        lines.append("❌ **BUILD ERROR** (This is what user sees on screen!)\n")
-        lines.append("```")
-        lines.append(message[:300])
-        lines.append("```\n")
+        buf.ln("❌ **BUILD ERROR** (This is what user sees on screen!)\n")
+        buf.ln("```")
+        buf.ln(message[:300])
+        buf.ln("```\n")
     else:
-        lines.append("✅ No preview error overlay\n")
+        buf.ln("✅ No preview error overlay\n")
 
     # 2. Console Errors
-    lines.append("## 2️⃣ Console Errors\n")
+    buf.ln("## 2️⃣ Console Errors\n")
     console_messages = preview.get("console_messages", [])
     error_count = 0
     recent_errors = []
 
     for msg in console_messages[-30:]:
         if msg.get("type") == "error":
+            # Keep counting every error, but only render the first 3
             error_count += 1
-            args = msg.get("args", [])
-            content = " ".join(str(arg) for arg in args)
             if len(recent_errors) < 3:
-                recent_errors.append(content[:150])
+                recent_errors.append(_join_args_bounded(msg.get("args", []), 150))
 
     if error_count > 0:
         issues_found += 1
-        lines.append(f"❌ **{error_count} console error(s)**\n")
+        buf.ln(f"❌ **{error_count} console error(s)**\n")
         for err in recent_errors:
-            lines.append(f"- {err}")
-        lines.append("")
+            buf.ln(f"- {err}")
+        buf.ln("")
     else:
-        lines.append("✅ No console errors\n")
+        buf.ln("✅ No console errors\n")
 
     # 3. Terminal Errors
-    lines.append("## 3️⃣ Terminal Outputs\n")
+    buf.ln("## 3️⃣ Terminal Outputs\n")
     terminals = webcontainer_state.get("terminals", [])
     terminal_errors = []
 
     for terminal in terminals:
         terminal_id = terminal.get("id", "unknown")
-        history = terminal.get("history", [])
-        last_output = terminal.get("last_output", [])
-
-        # Combine outputs
-        all_output = []
-        for entry in history[-20:]:
-            if isinstance(entry, dict):
-                all_output.append(entry.get("data", ""))
-            else:
-                all_output.append(str(entry))
-        all_output.extend(last_output[-20:] if last_output else [])
 
-        # Search for errors
-        for line in all_output:
+        # Search for errors (streamed, no combined list)
+        for line in _iter_terminal_tail(terminal, 20):
             line_str = str(line).lower()
             if any(keyword in line_str for keyword in ['error', 'err!', 'failed', 'enoent']):
                 terminal_errors.append(f"Terminal {terminal_id}: {str(line)[:150]}")
@@ -379,35 +483,32 @@ def get_comprehensive_error_snapshot(
 
     if terminal_errors:
         issues_found += 1
-        lines.append(f"❌ **Errors found in terminals**\n")
+        buf.ln(f"❌ **Errors found in terminals**\n")
         for err in terminal_errors[:3]:
-            lines.append(f"- {err}")
-        lines.append("")
+            buf.ln(f"- {err}")
+        buf.ln("")
     else:
-        lines.append("✅ No errors in terminal output\n")
+        buf.ln("✅ No errors in terminal output\n")
 
     # Summary
-    lines.append("=" * 60)
-    lines.append("\n## 📊 Summary\n")
+    buf.ln("=" * 60)
+    buf.ln("\n## 📊 Summary\n")
 
     if issues_found == 0:
-        lines.append("✅ **No issues detected!**")
-        lines.append("\nAll systems are operational.")
+        buf.ln("✅ **No issues detected!**")
+        buf.ln("\nAll systems are operational.")
     else:
-        lines.append(f"❌ **{issues_found} issue source(s) detected**\n")
-        lines.append("**Recommended actions:**")
-        lines.append("1. Start with preview error overlay (if present) - this is what blocks rendering")
-        lines.append("2. Then fix console errors - these are runtime issues")
-        lines.append("3. Finally check terminal errors - these might be build warnings")
-        lines.append("\n**Next steps:**")
-        lines.append("- Call `get_preview_error_overlay()` for detailed preview error")
-        lines.append("- Call `get_all_terminals_output()` for full terminal logs")
-        lines.append("- Call `analyze_build_error()` for smart error categorization")
-
-    return ToolResult(
-        success=True,
-        result="\n".join(lines)
-    )
+        buf.ln(f"❌ **{issues_found} issue source(s) detected**\n")
+        buf.ln("**Recommended actions:**")
+        buf.ln("1. Start with preview error overlay (if present) - this is what blocks rendering")
+        buf.ln("2. Then fix console errors - these are runtime issues")
+        buf.ln("3. Finally check terminal errors - these might be build warnings")
+        buf.ln("\n**Next steps:**")
+        buf.ln("- Call `get_preview_error_overlay()` for detailed preview error")
+        buf.ln("- Call `get_all_terminals_output()` for full terminal logs")
+        buf.ln("- Call `analyze_build_error()` for smart error categorization")
+
+    return buf.getvalue()
 
 
 # ============================================
@@ -63,12 +63,18 @@ class TodoItem:
         if isinstance(status, str):
             status = TodoStatus(status)
 
+        # Only format the current time when it is actually needed
+        if "created_at" in data:
+            created_at = data["created_at"]
+        else:
+            created_at = datetime.now().isoformat()
+
         return cls(
             content=data.get("content", ""),
             status=status,
             activeForm=data.get("activeForm", ""),
             priority=data.get("priority", 5),
-            created_at=data.get("created_at", datetime.now().isoformat()),
+            created_at=created_at,
             completed_at=data.get("completed_at"),
             notes=data.get("notes", ""),
         )
@@ -113,67 +119,82 @@ def todo_read(
             result="📋 Task List: Empty\n\nNo tasks yet. Use todo_write to create tasks."
         )
 
-    # Parse todos
-    todos = []
-    for item in todos_data:
-        if isinstance(item, dict):
-            todos.append(TodoItem.from_dict(item))
-        elif isinstance(item, TodoItem):
-            todos.append(item)
-
-    # Apply filters
-    filtered_todos = todos
-
-    if status:
-        status_enum = TodoStatus(status)
-        filtered_todos = [t for t in filtered_todos if t.status == status_enum]
-
-    if priority_min is not None:
-        filtered_todos = [t for t in filtered_todos if t.priority >= priority_min]
+    # Apply filters and group by status in a single pass.
+    # todo_read is a pure reader, so items are read as plain dicts rather
+    # than being parsed into TodoItem instances.
+    status_value = TodoStatus(status).value if status else None
+    buckets: Dict[str, List[dict]] = {
+        TodoStatus.PENDING.value: [],
+        TodoStatus.IN_PROGRESS.value: [],
+        TodoStatus.COMPLETED.value: [],
+    }
 
-    if not show_completed:
-        filtered_todos = [t for t in filtered_todos if t.status != TodoStatus.COMPLETED]
+    for t in todos_data:
+        if isinstance(t, TodoItem):
+            t = t.to_dict()
+        elif not isinstance(t, dict):
+            continue
+
+        t_status = t.get("status", TodoStatus.PENDING.value)
+        if status_value is not None and t_status != status_value:
+            continue
+        if priority_min is not None and t.get("priority", 5) < priority_min:
+            continue
+        if not show_completed and t_status == TodoStatus.COMPLETED.value:
+            continue
+
+        bucket = buckets.get(t_status)
+        if bucket is not None:
+            bucket.append(t)
+
+    pending = buckets[TodoStatus.PENDING.value]
+    in_progress = buckets[TodoStatus.IN_PROGRESS.value]
+    completed = buckets[TodoStatus.COMPLETED.value]
+    filtered_count = len(pending) + len(in_progress) + len(completed)
+
+    if not filtered_count:
+        return ToolResult(
+            success=True,
+            result="📋 Task List: No matching tasks"
+        )
 
     # Format output
     lines = ["📋 Task List\n"]
     lines.append("=" * 60)
 
-    # Group by status
-    pending = [t for t in filtered_todos if t.status == TodoStatus.PENDING]
-    in_progress = [t for t in filtered_todos if t.status == TodoStatus.IN_PROGRESS]
-    completed = [t for t in filtered_todos if t.status == TodoStatus.COMPLETED]
-
     # In Progress (most important)
     if in_progress:
         lines.append("\n🔄 In Progress:")
         for i, todo in enumerate(in_progress, 1):
-            priority_str = f"[P{todo.priority}]" if todo.priority > 5 else ""
-            lines.append(f"  {i}. {priority_str} {todo.content}")
-            if todo.activeForm:
-                lines.append(f"     ➤ {todo.activeForm}")
-            if todo.notes:
-                lines.append(f"     💡 {todo.notes}")
+            priority = todo.get("priority", 5)
+            priority_str = f"[P{priority}]" if priority > 5 else ""
+            lines.append(f"  {i}. {priority_str} {todo.get('content', '')}")
+            if todo.get("activeForm"):
+                lines.append(f"     ➤ {todo['activeForm']}")
+            if todo.get("notes"):
+                lines.append(f"     💡 {todo['notes']}")
 
     # Pending
     if pending:
         lines.append("\n⏳ Pending:")
         for i, todo in enumerate(pending, 1):
-            priority_str = f"[P{todo.priority}]" if todo.priority > 5 else ""
-            lines.append(f"  {i}. {priority_str} {todo.content}")
-            if todo.notes:
-                lines.append(f"     💡 {todo.notes}")
+            priority = todo.get("priority", 5)
+            priority_str = f"[P{priority}]" if priority > 5 else ""
+            lines.append(f"  {i}. {priority_str} {todo.get('content', '')}")
+            if todo.get("notes"):
+                lines.append(f"     💡 {todo['notes']}")
 
     # Completed (if shown)
     if show_completed and completed:
         lines.append("\n✅ Completed:")
         for i, todo in enumerate(completed, 1):
-            lines.append(f"  {i}. {todo.content}")
-            if todo.completed_at:
-                lines.append(f"     ✓ Completed at: {todo.completed_at}")
+            lines.append(f"  {i}. {todo.get('content', '')}")
+            if todo.get("completed_at"):
+                lines.append(f"     ✓ Completed at: {todo['completed_at']}")
 
     # Summary
     lines.append(f"\n{'-' * 60}")
-    lines.append(f"Total: {len(filtered_todos)} tasks")
+    lines.append(f"Total: {filtered_count} tasks")
     lines.append(f"  🔄 In Progress: {len(in_progress)}")
     lines.append(f"  ⏳ Pending: {len(pending)}")
     if show_completed:
@@ -227,9 +248,10 @@ def todo_write(
             result="Invalid todos format. Must be a list of todo items."
         )
 
-    # Parse and validate each todo
-    validated_todos = []
+    # Validate each todo and build its dict form in the same pass
+    todos_dict = []
     in_progress_count = 0
+    now_iso = datetime.now().isoformat()  # shared default created_at
 
     for i, todo_data in enumerate(todos):
         if not isinstance(todo_data, dict):
@@ -269,15 +291,16 @@ def todo_write(
         if status == "in_progress":
             in_progress_count += 1
 
-        # Create TodoItem
-        try:
-            todo_item = TodoItem.from_dict(todo_data)
-            validated_todos.append(todo_item)
-        except Exception as e:
-            return ToolResult(
-                success=False,
-                result=f"Error parsing todo at index {i}: {e}"
-            )
+        # Emit the normalized dict directly (same shape as TodoItem.to_dict)
+        todos_dict.append({
+            "content": todo_data["content"],
+            "status": status,
+            "activeForm": todo_data["activeForm"],
+            "priority": todo_data.get("priority", 5),
+            "created_at": todo_data.get("created_at", now_iso),
+            "completed_at": todo_data.get("completed_at"),
+            "notes": todo_data.get("notes", ""),
+        })
 
     # Warn if multiple tasks are in progress
     if in_progress_count > 1:
@@ -286,15 +309,12 @@ def todo_write(
             result=f"Warning: {in_progress_count} tasks are marked as 'in_progress'. Only one task should be in progress at a time."
         )
 
-    if in_progress_count == 0 and validated_todos:
+    if in_progress_count == 0 and todos_dict:
         return ToolResult(
             success=False,
             result="Warning: No tasks are marked as 'in_progress'. At least one task should be in progress."
         )
 
-    # Convert to dict format for action
-    todos_dict = [todo.to_dict() for todo in validated_todos]
-
     # Create action to update WebContainer state
     action = {
         "type": "update_todos",
@@ -304,12 +324,11 @@ def todo_write(
     }
 
     # Format summary
-    pending = sum(1 for t in validated_todos if t.status == TodoStatus.PENDING)
-    in_progress = sum(1 for t in validated_todos if t.status == TodoStatus.IN_PROGRESS)
-    completed = sum(1 for t in validated_todos if t.status == TodoStatus.COMPLETED)
+    pending = sum(1 for t in todos_dict if t["status"] == "pending")
+    completed = len(todos_dict) - pending - in_progress_count
 
-    summary = f"Task list updated: {len(validated_todos)} total tasks\n"
-    summary += f"  🔄 In Progress: {in_progress}\n"
+    summary = f"Task list updated: {len(todos_dict)} total tasks\n"
+    summary += f"  🔄 In Progress: {in_progress_count}\n"
     summary += f"  ⏳ Pending: {pending}\n"
     summary += f"  ✅ Completed: {completed}"
 
@@ -20,226 +20,256 @@ Tool Registry
 """
 
 from __future__ import annotations
-from typing import Dict, List, Any, Callable, Optional
-
-# Import all tool modules
-from .webcontainer_tools import (
-    # File operations
-    read_file,
-    write_file,
-    edit_file,
-    delete_file,
-    rename_file,
-    create_directory,
-    list_files,
-    file_exists,
-    get_project_structure,
-    search_in_file,
-    search_in_project,
-
-    # Terminal operations
-    run_command,
-    install_dependencies,
-    start_dev_server,
-    stop_server,
-    create_terminal,
-    switch_terminal,
-    send_terminal_input,
-    kill_terminal,
-    get_terminal_output,
-    get_terminal_history,
-    list_terminals,
-
-    # Preview operations
-    take_screenshot,
-    get_console_messages,
-    get_preview_dom,
-    clear_console,
-    get_preview_status,
-
-    # Diagnostic
-    verify_changes,
-
-    # Tool definitions
-    get_tool_definitions as get_webcontainer_tool_definitions,
-)
-
-from .claude_code_tools import (
-    glob,
-    grep,
-    ls,
-    bash,
-    get_claude_code_tool_definitions,
-    CLAUDE_CODE_TOOLS,
-)
-
-from .todo_tools import (
-    todo_read,
-    todo_write,
-    get_todo_tool_definitions,
-    TODO_TOOLS,
-)
-
-from .task_tool import (
-    task,
-    get_subagent_status,
-    get_task_tool_definitions,
-    TASK_TOOLS,
-)
+from typing import Dict, List, Any, Callable, Mapping, Optional, Tuple
+from types import MappingProxyType
 
-from .network_tools import (
-    web_fetch,
-    web_search,
-    get_network_tool_definitions,
-    NETWORK_TOOLS,
-)
+import functools
+import importlib
+import sys
 
-from .terminal_preview_reader_tools import (
-    get_all_terminals_output,
-    get_preview_error_overlay,
-    get_comprehensive_error_snapshot,
-    get_terminal_preview_reader_tool_definitions,
-    TERMINAL_PREVIEW_READER_TOOLS,
-)
+# ============================================
+# Lazy Tool Loading
+# ============================================
 
-from .preview_diagnostic_tools import (
-    diagnose_preview_state,
-    get_preview_diagnostic_tool_definitions,
-    PREVIEW_DIAGNOSTIC_TOOLS,
-)
+# Tool name -> defining submodule. Submodules are only imported when one of
+# their tools (or a registry containing it) is first accessed.
+_TOOL_MODULES: Dict[str, str] = {
+    # webcontainer_tools
+    "read_file": ".webcontainer_tools",
+    "write_file": ".webcontainer_tools",
+    "edit_file": ".webcontainer_tools",
+    "delete_file": ".webcontainer_tools",
+    "rename_file": ".webcontainer_tools",
+    "create_directory": ".webcontainer_tools",
+    "list_files": ".webcontainer_tools",
+    "file_exists": ".webcontainer_tools",
+    "get_project_structure": ".webcontainer_tools",
+    "search_in_file": ".webcontainer_tools",
+    "search_in_project": ".webcontainer_tools",
+    "run_command": ".webcontainer_tools",
+    "install_dependencies": ".webcontainer_tools",
+    "start_dev_server": ".webcontainer_tools",
+    "stop_server": ".webcontainer_tools",
+    "create_terminal": ".webcontainer_tools",
+    "switch_terminal": ".webcontainer_tools",
+    "send_terminal_input": ".webcontainer_tools",
+    "kill_terminal": ".webcontainer_tools",
+    "get_terminal_output": ".webcontainer_tools",
+    "get_terminal_history": ".webcontainer_tools",
+    "list_terminals": ".webcontainer_tools",
+    "take_screenshot": ".webcontainer_tools",
+    "get_console_messages": ".webcontainer_tools",
+    "get_preview_dom": ".webcontainer_tools",
+    "clear_console": ".webcontainer_tools",
+    "get_preview_status": ".webcontainer_tools",
+    "verify_changes": ".webcontainer_tools",
+
+    # claude_code_tools
+    "glob": ".claude_code_tools",
+    "grep": ".claude_code_tools",
+    "ls": ".claude_code_tools",
+    "bash": ".claude_code_tools",
+
+    # todo_tools
+    "todo_read": ".todo_tools",
+    "todo_write": ".todo_tools",
+
+    # task_tool
+    "task": ".task_tool",
+    "get_subagent_status": ".task_tool",
+
+    # network_tools
+    "web_fetch": ".network_tools",
+    "web_search": ".network_tools",
+
+    # terminal_preview_reader_tools
+    "get_all_terminals_output": ".terminal_preview_reader_tools",
+    "get_preview_error_overlay": ".terminal_preview_reader_tools",
+    "get_comprehensive_error_snapshot": ".terminal_preview_reader_tools",
+
+    # preview_diagnostic_tools
+    "diagnose_preview_state": ".preview_diagnostic_tools",
+
+    # self_healing_tools
+    "start_healing_loop": ".self_healing_tools",
+    "verify_healing_progress": ".self_healing_tools",
+    "stop_healing_loop": ".self_healing_tools",
+    "get_healing_status": ".self_healing_tools",
+
+    # error_handling_tools
+    "analyze_build_error": ".error_handling_tools",
+}
 
-from .self_healing_tools import (
-    start_healing_loop,
-    verify_healing_progress,
-    stop_healing_loop,
-    get_healing_status,
-    get_self_healing_tool_definitions,
-    SELF_HEALING_TOOLS,
+# (submodule, function) pairs that produce tool definitions, in API order
+_DEFINITION_SOURCES = (
+    (".webcontainer_tools", "get_tool_definitions"),
+    (".claude_code_tools", "get_claude_code_tool_definitions"),
+    (".todo_tools", "get_todo_tool_definitions"),
+    (".task_tool", "get_task_tool_definitions"),
+    (".network_tools", "get_network_tool_definitions"),
+    # 重要的诊断工具
+    (".terminal_preview_reader_tools", "get_terminal_preview_reader_tool_definitions"),
+    (".preview_diagnostic_tools", "get_preview_diagnostic_tool_definitions"),
+    (".error_handling_tools", "get_error_handling_tool_definitions"),
+    (".self_healing_tools", "get_self_healing_tool_definitions"),
 )
 
-from .error_handling_tools import (
-    analyze_build_error,
-    get_error_handling_tool_definitions,
-    ERROR_HANDLING_TOOLS,
-)
+def _load_tool(name: str) -> Callable:
+    """Import the tool's submodule on first use and return the tool function"""
+    meta = _TOOL_META[name]
+    fn = meta.fn
+    if fn is None:
+        module = importlib.import_module(_TOOL_MODULES[name], __package__)
+        fn = meta.fn = getattr(module, name)
+    return fn
 
 
 # ============================================
 # Tool Categories
 # ============================================
 
-# Category 1: File Operations (文件操作)
-FILE_TOOLS = {
-    "read_file": read_file,
-    "write_file": write_file,
-    "edit_file": edit_file,
-    "delete_file": delete_file,
-    "rename_file": rename_file,
-    "create_directory": create_directory,
-    "file_exists": file_exists,
+# Category membership is kept as plain tool names so that iterating
+# categories never forces a submodule import. Frozen (read-only mapping of
+# tuples) so it can be shared without defensive copies.
+TOOL_CATEGORIES: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    # Category 1: File Operations (文件操作)
+    "file_operations": (
+        "read_file",
+        "write_file",
+        "edit_file",
+        "delete_file",
+        "rename_file",
+        "create_directory",
+        "file_exists",
+    ),
+    # Category 2: Search & Discovery (搜索和发现)
+    "search_discovery": (
+        "glob",  # FJ1
+        "grep",  # XJ1
+        "ls",
+        "list_files",
+        "get_project_structure",
+        "search_in_file",
+        "search_in_project",
+    ),
+    # Category 3: Task Management (任务管理) - todo_tools.py + task_tool.py
+    "task_management": (
+        "todo_read",
+        "todo_write",
+        "task",
+        "get_subagent_status",
+    ),
+    # Category 4: System Execution (系统执行)
+    "system_execution": (
+        "bash",
+        "run_command",
+    ),
+    # Category 5: Network (网络) - network_tools.py
+    "network": (
+        "web_fetch",
+        "web_search",
+    ),
+    # Category 6: Terminal (终端管理)
+    "terminal": (
+        "install_dependencies",
+        "start_dev_server",
+        "stop_server",
+        "create_terminal",
+        "switch_terminal",
+        "send_terminal_input",
+        "kill_terminal",
+        "get_terminal_output",
+        "get_terminal_history",
+        "list_terminals",
+    ),
+    # Category 7: Preview (预览操作)
+    "preview": (
+        "take_screenshot",
+        "get_console_messages",
+        "get_preview_dom",
+        "clear_console",
+        "get_preview_status",
+    ),
+    # Category 8: Diagnostic (诊断)
+    "diagnostic": (
+        "verify_changes",
+        # Terminal & Preview Reader Tools
+        "get_all_terminals_output",
+        "get_preview_error_overlay",
+        "get_comprehensive_error_snapshot",
+        # Preview Diagnostic Tool
+        "diagnose_preview_state",
+        # Error Handling Tools
+        "analyze_build_error",
+        # Self-Healing Tools
+        "start_healing_loop",
+        "verify_healing_progress",
+        "stop_healing_loop",
+        "get_healing_status",
+    ),
+})
+
+# Lazily built name -> function registries, one per category
+_CATEGORY_REGISTRIES = {
+    "FILE_TOOLS": "file_operations",
+    "SEARCH_TOOLS": "search_discovery",
+    "TASK_MANAGEMENT_TOOLS": "task_management",
+    "SYSTEM_TOOLS": "system_execution",
+    "NETWORK_TOOLS": "network",
+    "TERMINAL_TOOLS": "terminal",
+    "PREVIEW_TOOLS": "preview",
+    "DIAGNOSTIC_TOOLS": "diagnostic",
 }
 
-# Category 2: Search & Discovery (搜索和发现)
-SEARCH_TOOLS = {
-    "glob": glob,  # FJ1
-    "grep": grep,  # XJ1
-    "ls": ls,
-    "list_files": list_files,
-    "get_project_structure": get_project_structure,
-    "search_in_file": search_in_file,
-    "search_in_project": search_in_project,
-}
-
-# Category 3: Task Management (任务管理)
-# Already imported from task_tool.py and todo_tools.py
-TASK_MANAGEMENT_TOOLS = {
-    **TODO_TOOLS,  # todo_read, todo_write
-    **TASK_TOOLS,  # task, get_subagent_status
-}
-
-# Category 4: System Execution (系统执行)
-SYSTEM_TOOLS = {
-    "bash": bash,
-    "run_command": run_command,
-}
-
-# Category 5: Network (网络)
-# Already imported from network_tools.py
-
-# Category 6: Terminal (终端管理)
-TERMINAL_TOOLS = {
-    "install_dependencies": install_dependencies,
-    "start_dev_server": start_dev_server,
-    "stop_server": stop_server,
-    "create_terminal": create_terminal,
-    "switch_terminal": switch_terminal,
-    "send_terminal_input": send_terminal_input,
-    "kill_terminal": kill_terminal,
-    "get_terminal_output": get_terminal_output,
-    "get_terminal_history": get_terminal_history,
-    "list_terminals": list_terminals,
-}
-
-# Category 7: Preview (预览操作)
-PREVIEW_TOOLS = {
-    "take_screenshot": take_screenshot,
-    "get_console_messages": get_console_messages,
-    "get_preview_dom": get_preview_dom,
-    "clear_console": clear_console,
-    "get_preview_status": get_preview_status,
-}
+# All tool names in registry order (same order as ALL_TOOLS)
+_ALL_TOOL_NAMES: List[str] = [
+    sys.intern(name) for names in TOOL_CATEGORIES.values() for name in names
+]
 
-# Category 8: Diagnostic (诊断)
-DIAGNOSTIC_TOOLS = {
-    "verify_changes": verify_changes,
-    # Terminal & Preview Reader Tools
-    "get_all_terminals_output": get_all_terminals_output,
-    "get_preview_error_overlay": get_preview_error_overlay,
-    "get_comprehensive_error_snapshot": get_comprehensive_error_snapshot,
-    # Preview Diagnostic Tool
-    "diagnose_preview_state": diagnose_preview_state,
-    # Error Handling Tools
-    "analyze_build_error": analyze_build_error,
-    # Self-Healing Tools
-    "start_healing_loop": start_healing_loop,
-    "verify_healing_progress": verify_healing_progress,
-    "stop_healing_loop": stop_healing_loop,
-    "get_healing_status": get_healing_status,
-}
+# Categories must not overlap, otherwise ALL_TOOLS would silently drop one
+if len(set(_ALL_TOOL_NAMES)) != len(_ALL_TOOL_NAMES):
+    raise ValueError("Tool registered in more than one category")
 
 
 # ============================================
 # Unified Tool Registry
 # ============================================
 
-ALL_TOOLS: Dict[str, Callable] = {
-    **FILE_TOOLS,
-    **SEARCH_TOOLS,
-    **TASK_MANAGEMENT_TOOLS,
-    **SYSTEM_TOOLS,
-    **NETWORK_TOOLS,
-    **TERMINAL_TOOLS,
-    **PREVIEW_TOOLS,
-    **DIAGNOSTIC_TOOLS,
-}
+def __getattr__(name: str) -> Any:
+    """
+    PEP 562 module attribute hook.
+
+    Resolves individual tool functions, the per-category registries
+    (FILE_TOOLS, ...) and ALL_TOOLS on first access, then caches them as
+    regular module globals.
+    """
+    if name in _TOOL_MODULES:
+        value = _load_tool(name)
+    elif name in _CATEGORY_REGISTRIES:
+        value = {
+            tool: _load_tool(tool)
+            for tool in TOOL_CATEGORIES[_CATEGORY_REGISTRIES[name]]
+        }
+    elif name == "ALL_TOOLS":
+        # One dict filled by chained updates from the category registries
+        # (reusing any that were already built) instead of ** merges
+        value = {}
+        for registry in _CATEGORY_REGISTRIES:
+            category_tools = globals().get(registry)
+            if category_tools is None:
+                category_tools = __getattr__(registry)
+            value.update(category_tools)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
 
 
 # ============================================
 # Tool Metadata
 # ============================================
 
-TOOL_CATEGORIES = {
-    "file_operations": list(FILE_TOOLS.keys()),
-    "search_discovery": list(SEARCH_TOOLS.keys()),
-    "task_management": list(TASK_MANAGEMENT_TOOLS.keys()),
-    "system_execution": list(SYSTEM_TOOLS.keys()),
-    "network": list(NETWORK_TOOLS.keys()),
-    "terminal": list(TERMINAL_TOOLS.keys()),
-    "preview": list(PREVIEW_TOOLS.keys()),
-    "diagnostic": list(DIAGNOSTIC_TOOLS.keys()),
-}
-
-
 # Concurrency safety metadata
 # True = 并发安全 (可以同时调用多个)
 # False = 非并发安全 (同一时间只能有一个在执行)
@@ -359,46 +389,95 @@ TOOL_PRIORITIES = {
 
 
 # ============================================
-# Tool Definitions (for Claude API)
+# Packed Per-Tool Metadata
 # ============================================
 
-def get_all_tool_definitions() -> List[dict]:
+class ToolMeta:
     """
-    获取所有工具的定义
-
-    Returns:
-        List of tool definitions in Claude API format
+    Everything the scheduler/dispatcher needs about one tool, so a single
+    dict lookup answers function, priority, concurrency safety and category.
+    fn is filled in lazily by _load_tool().
     """
-    definitions = []
 
-    # Add WebContainer tools
-    definitions.extend(get_webcontainer_tool_definitions())
+    __slots__ = ("fn", "priority", "safe", "category")
+
+    def __init__(self, priority: int, safe: bool, category: Optional[str]):
+        self.fn: Optional[Callable] = None
+        self.priority = priority
+        self.safe = safe
+        self.category = category
+
+
+def _build_tool_meta() -> Dict[str, ToolMeta]:
+    """Merge categories, concurrency safety and priorities into one record per tool"""
+    tool_category = {
+        tool: category
+        for category, tools in TOOL_CATEGORIES.items()
+        for tool in tools
+    }
+    names = dict.fromkeys(
+        list(_TOOL_MODULES) + list(TOOL_CONCURRENCY_SAFE) + list(TOOL_PRIORITIES)
+    )
+    # Keys are interned so lookups with interned names (e.g. names taken
+    # from TOOL_CATEGORIES / _ALL_TOOL_NAMES) hit dict's identity fast path
+    return {
+        sys.intern(name): ToolMeta(
+            priority=TOOL_PRIORITIES.get(name, 5),
+            safe=TOOL_CONCURRENCY_SAFE.get(name, False),
+            category=tool_category.get(name),
+        )
+        for name in names
+    }
+
+
+_TOOL_META: Dict[str, ToolMeta] = _build_tool_meta()
+
+
+# ============================================
+# Tool Definitions (for Claude API)
+# ============================================
+
+@functools.cache
+def _all_tool_definitions() -> tuple:
+    """Build the combined definitions once; the result is static after import"""
+    definitions = []
 
-    # Add Claude Code style tools
-    definitions.extend(get_claude_code_tool_definitions())
+    for module_name, getter in _DEFINITION_SOURCES:
+        module = importlib.import_module(module_name, __package__)
+        definitions.extend(getattr(module, getter)())
 
-    # Add Todo tools
-    definitions.extend(get_todo_tool_definitions())
+    return tuple(definitions)
 
-    # Add Task tools
-    definitions.extend(get_task_tool_definitions())
 
-    # Add Network tools
-    definitions.extend(get_network_tool_definitions())
+def get_all_tool_definitions() -> List[dict]:
+    """
+    获取所有工具的定义
 
-    # Add Terminal/Preview Reader tools (重要的诊断工具)
-    definitions.extend(get_terminal_preview_reader_tool_definitions())
+    Returns:
+        List of tool definitions in Claude API format (a fresh list, since
+        callers extend it with their own definitions)
+    """
+    return list(_all_tool_definitions())
 
-    # Add Preview Diagnostic tools
-    definitions.extend(get_preview_diagnostic_tool_definitions())
 
-    # Add Error Handling tools
-    definitions.extend(get_error_handling_tool_definitions())
+def resolve_tool(name: str) -> Optional[ToolMeta]:
+    """
+    根据名称解析工具 (函数 + 优先级 + 并发安全, 一次查找)
 
-    # Add Self-Healing tools
-    definitions.extend(get_self_healing_tool_definitions())
+    Args:
+        name: Tool name
 
-    return definitions
+    Returns:
+        ToolMeta with fn loaded, or None if no tool function is registered
+        under that name (including names that only carry priority or
+        concurrency metadata)
+    """
+    meta = _TOOL_META.get(name)
+    if meta is None:
+        return None
+    if meta.fn is None and meta.category is not None:
+        _load_tool(name)
+    return meta if meta.fn is not None else None
 
 
 def get_tool_by_name(name: str) -> Optional[Callable]:
@@ -411,7 +490,8 @@ def get_tool_by_name(name: str) -> Optional[Callable]:
     Returns:
         Tool function or None if not found
     """
-    return ALL_TOOLS.get(name)
+    meta = resolve_tool(name)
+    return meta.fn if meta else None
 
 
 def is_tool_concurrency_safe(name: str) -> bool:
@@ -424,7 +504,8 @@ def is_tool_concurrency_safe(name: str) -> bool:
     Returns:
         True if tool is concurrency safe
     """
-    return TOOL_CONCURRENCY_SAFE.get(name, False)
+    meta = _TOOL_META.get(name)
+    return meta.safe if meta else False
 
 
 def get_tool_priority(name: str) -> int:
@@ -437,10 +518,11 @@ def get_tool_priority(name: str) -> int:
     Returns:
         Priority level (1-10)
     """
-    return TOOL_PRIORITIES.get(name, 5)
+    meta = _TOOL_META.get(name)
+    return meta.priority if meta else 5
 
 
-def get_tools_by_category(category: str) -> List[str]:
+def get_tools_by_category(category: str) -> Tuple[str, ...]:
     """
     获取指定类别的工具列表
 
@@ -448,70 +530,71 @@ def get_tools_by_category(category: str) -> List[str]:
         category: Category name
 
     Returns:
-        List of tool names
+        Tuple of tool names (shared, immutable)
     """
-    return TOOL_CATEGORIES.get(category, [])
+    return TOOL_CATEGORIES.get(category, ())
 
 
-def get_subagent_tools(agent_type: str) -> List[str]:
-    """
-    获取SubAgent可用的工具列表
-
-    Args:
-        agent_type: SubAgent类型 ("explore", "plan", "debug", "general")
-
-    Returns:
-        List of allowed tool names
-    """
+@functools.lru_cache(maxsize=8)
+def _subagent_tools_cached(agent_type: str) -> tuple:
+    """Tool names per SubAgent type; only a handful of types exist"""
     if agent_type == "explore":
         # Explore Agent: 只读工具(不包括写操作)
-        read_only_file_tools = ["read_file", "file_exists"]
+        read_only_file_tools = ("read_file", "file_exists")
         return (
             read_only_file_tools +
-            list(SEARCH_TOOLS.keys()) +
-            ["todo_read", "get_subagent_status"] +
-            ["get_terminal_output", "get_terminal_history", "list_terminals"] +
-            list(PREVIEW_TOOLS.keys()) +
-            list(DIAGNOSTIC_TOOLS.keys())
+            TOOL_CATEGORIES["search_discovery"] +
+            ("todo_read", "get_subagent_status") +
+            ("get_terminal_output", "get_terminal_history", "list_terminals") +
+            TOOL_CATEGORIES["preview"] +
+            TOOL_CATEGORIES["diagnostic"]
         )
 
     elif agent_type == "plan":
         # Plan Agent: 只读 + 计划工具
-        return get_subagent_tools("explore") + [
+        return _subagent_tools_cached("explore") + (
             "write_file",  # Can create plan files
             "todo_write",
-        ]
+        )
 
     elif agent_type == "debug-specialist":
         # Debug Agent: 只读 + 诊断工具
-        return get_subagent_tools("explore") + [
+        return _subagent_tools_cached("explore") + (
             "bash",  # Can run diagnostic commands
             "run_command",
             "read_file",  # Additional read access for debugging
-        ]
+        )
 
     elif agent_type == "general-purpose":
         # General Agent: 所有工具
-        return list(ALL_TOOLS.keys())
+        return tuple(_ALL_TOOL_NAMES)
 
     else:
         # Unknown type, return read-only tools
-        return get_subagent_tools("explore")
+        return _subagent_tools_cached("explore")
 
 
-# ============================================
-# Tool Statistics
-# ============================================
-
-def get_tool_statistics() -> dict:
+def get_subagent_tools(agent_type: str) -> List[str]:
     """
-    获取工具统计信息
+    获取SubAgent可用的工具列表
+
+    Args:
+        agent_type: SubAgent类型 ("explore", "plan", "debug", "general")
 
     Returns:
-        Statistics dict
+        List of allowed tool names
     """
+    return list(_subagent_tools_cached(agent_type))
+
+
+# ============================================
+# Tool Statistics
+# ============================================
+
+def _compute_tool_statistics() -> dict:
+    """Derive statistics from the (import-time constant) registries"""
     return {
-        "total_tools": len(ALL_TOOLS),
+        "total_tools": len(_ALL_TOOL_NAMES),
         "categories": {
             category: len(tools)
             for category, tools in TOOL_CATEGORIES.items()
@@ -521,6 +604,19 @@ def get_tool_statistics() -> dict:
     }
 
 
+_TOOL_STATISTICS = _compute_tool_statistics()
+
+
+def get_tool_statistics() -> dict:
+    """
+    获取工具统计信息
+
+    Returns:
+        Statistics dict (shared, precomputed at import - do not mutate)
+    """
+    return _TOOL_STATISTICS
+
+
 # ============================================
 # Export
 # ============================================
@@ -533,6 +629,8 @@ __all__ = [
     "TOOL_PRIORITIES",
 
     # Tool getters
+    "ToolMeta",
+    "resolve_tool",
     "get_all_tool_definitions",
     "get_tool_by_name",
     "is_tool_concurrency_safe",
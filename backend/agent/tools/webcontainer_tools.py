@@ -17,8 +17,14 @@ Enhanced Features:
 """
 
 from __future__ import annotations
-from typing import Any, Optional, List, Dict
+from typing import Any, Callable, Optional, List, Dict, Sequence
+from collections import deque
 from dataclasses import dataclass
+from itertools import islice
+import functools
+import heapq
+import io
+import json
 import re
 import fnmatch
 
@@ -32,14 +38,82 @@ MAX_CONSOLE_MESSAGES = 100  # Maximum console messages to return
 MAX_SEARCH_RESULTS = 50  # Maximum search results to return
 MAX_HISTORY_LINES = 500  # Maximum terminal history lines
 
+_DIVIDER = "-" * 40  # Separates a listing's header from its lines
+
+# Console message types accepted by get_console_messages, and their icons
+_VALID_CONSOLE_TYPES = frozenset({"log", "warn", "error", "info", "debug"})
+_TYPE_ICONS = {
+    "log": "📝",
+    "info": "ℹ️",
+    "warn": "⚠️",
+    "error": "❌",
+    "debug": "🔍"
+}
+
+
+# ============================================
+# Path Helpers
+# ============================================
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_path(path: str) -> str:
+    """
+    Ensure a leading slash ("src/App.jsx" -> "/src/App.jsx").
+
+    Pure, so it is memoized; the agent touches a small set of paths
+    repeatedly and the bounded cache caps memory.
+    """
+    return path if path[:1] == "/" else "/" + path
+
+
+def _format_listing(header: str, lines: List[str]) -> str:
+    """Header, divider and lines in one join (no intermediate concatenations)"""
+    return "\n".join([header, _DIVIDER, *lines] if lines else [header, _DIVIDER, ""])
+
+
+def _lookup_file(webcontainer_state: dict, path: str) -> tuple:
+    """
+    Resolve path against the state's files in one step.
+
+    File keys are canonicalized to a leading slash at state ingestion, so a
+    single lookup on the normalized path is enough.
+
+    Returns:
+        (normalized_path, files, content) - content is None if missing
+    """
+    normalized_path = _normalize_path(path)
+    files = webcontainer_state.get("files", {})
+    return normalized_path, files, files.get(normalized_path)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_glob(pattern: str) -> Callable[[str], Optional[re.Match]]:
+    """
+    Compile a glob pattern once and return its match function.
+
+    Same semantics as fnmatch.fnmatch on POSIX (case-sensitive), without
+    re-resolving the pattern for every path being tested.
+    """
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_search_pattern(pattern: str, flags: int = re.IGNORECASE) -> re.Pattern:
+    """
+    Compile a user search pattern, memoized across calls (agents repeat
+    the same searches). Raises re.error exactly like re.compile; failures
+    are not cached.
+    """
+    return re.compile(pattern, flags)
+
 
 # ============================================
 # Tool Result Types
 # ============================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ToolResult:
-    """Result from tool execution"""
+    """Result from tool execution (slotted + immutable: one per tool call)"""
     success: bool
     result: str
     action: Optional[dict] = None  # Action to send to frontend (if needed)
@@ -51,6 +125,11 @@ class ToolResult:
         return f"Error: {self.result}"
 
 
+def _action(kind: str, **payload) -> dict:
+    """Build a frontend action: {"type": kind, "payload": {...}}"""
+    return {"type": kind, "payload": payload}
+
+
 # ============================================
 # State Query Tools (No frontend action needed)
 # ============================================
@@ -72,33 +151,131 @@ def read_file(path: str, webcontainer_state: Optional[dict] = None) -> ToolResul
             result="WebContainer state not available"
         )
 
-    # Normalize path
-    normalized_path = path if path.startswith("/") else f"/{path}"
-
-    files = webcontainer_state.get("files", {})
-
-    if normalized_path in files:
-        content = files[normalized_path]
+    normalized_path, files, content = _lookup_file(webcontainer_state, path)
+    if content is not None:
         return ToolResult(
             success=True,
             result=f"Content of {normalized_path}:\n```\n{content}\n```"
         )
 
-    # Try without leading slash
-    alt_path = path.lstrip("/")
-    if alt_path in files:
-        content = files[alt_path]
-        return ToolResult(
-            success=True,
-            result=f"Content of {alt_path}:\n```\n{content}\n```"
-        )
-
     return ToolResult(
         success=False,
-        result=f"File not found: {path}. Available files: {list(files.keys())[:10]}"
+        result=f"File not found: {path}. Available files: {list(islice(files, 10))}"
     )
 
 
+# Single-slot cache of the directory index for the most recent files dict.
+# The state's files dict is replaced wholesale on every frontend state
+# update, so (identity, size) is enough to detect a new snapshot; the
+# entry holds a reference to the dict so its id cannot be reused.
+_dir_index_cache: Optional[tuple] = None
+
+
+def _build_dir_index(files: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+    """
+    Build {directory: {child_name: "file" | "directory"}} in one pass.
+
+    Directory keys have a leading slash and no trailing slash ("" is the
+    root). When a name is both a file and a directory, the last file in
+    iteration order decides, as in the original per-call scan.
+    """
+    index: Dict[str, Dict[str, str]] = {}
+
+    for file_path in files:
+        norm_file_path = _normalize_path(file_path)
+
+        # Every "/" marks a directory boundary: norm_file_path[:slash] is an
+        # ancestor directory and the next component is its child.
+        slash = norm_file_path.find("/")
+        while slash != -1:
+            directory = norm_file_path[:slash]
+            rel_path = norm_file_path[slash:].lstrip("/")
+            if rel_path and not directory.endswith("/"):
+                first, sep, _ = rel_path.partition("/")
+                index.setdefault(directory, {})[first] = "directory" if sep else "file"
+            slash = norm_file_path.find("/", slash + 1)
+
+    return index
+
+
+def _get_dir_index(files: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+    """Return the cached directory index for files, rebuilding on change"""
+    global _dir_index_cache
+
+    cached = _dir_index_cache
+    if cached is not None and cached[0] is files and cached[1] == len(files):
+        return cached[2]
+
+    index = _build_dir_index(files)
+    _dir_index_cache = (files, len(files), index)
+    return index
+
+
+# Single-slot cache of the directory set, same invalidation rule as
+# _dir_index_cache
+_dir_set_cache: Optional[tuple] = None
+
+
+def _get_dir_set(files: Dict[str, str]) -> frozenset:
+    """
+    Return every path prefix that is followed by "/" in some key, i.e.
+    exactly the paths p for which some key starts with p + "/".
+    """
+    global _dir_set_cache
+
+    cached = _dir_set_cache
+    if cached is not None and cached[0] is files and cached[1] == len(files):
+        return cached[2]
+
+    dirs = set()
+    for file_path in files:
+        slash = file_path.find("/")
+        while slash != -1:
+            dirs.add(file_path[:slash])
+            slash = file_path.find("/", slash + 1)
+
+    dir_set = frozenset(dirs)
+    _dir_set_cache = (files, len(files), dir_set)
+    return dir_set
+
+
+# Single-slot cache of the project-search index, same invalidation rule as
+# _dir_index_cache
+_search_index_cache: Optional[tuple] = None
+
+# "*.ext" globs that can be answered from the extension index
+_SIMPLE_EXT_GLOB = re.compile(r"\*\.([^*?\[\]./]+)")
+
+
+def _get_search_index(files: Dict[str, str]) -> tuple:
+    """
+    Return (searchable, by_ext) for files, in key order.
+
+    searchable: [(file key, key without leading "/")] for every file that
+        project search looks at (node_modules is skipped)
+    by_ext: {extension: [file keys]} over the same files
+    """
+    global _search_index_cache
+
+    cached = _search_index_cache
+    if cached is not None and cached[0] is files and cached[1] == len(files):
+        return cached[2]
+
+    searchable: List[tuple] = []
+    by_ext: Dict[str, List[str]] = {}
+    for file_path in files:
+        if "node_modules" in file_path:
+            continue
+        searchable.append((file_path, file_path.lstrip("/")))
+        _, dot, ext = file_path.rpartition(".")
+        if dot:
+            by_ext.setdefault(ext, []).append(file_path)
+
+    index = (searchable, by_ext)
+    _search_index_cache = (files, len(files), index)
+    return index
+
+
 def list_files(path: str = "/", webcontainer_state: Optional[dict] = None) -> ToolResult:
     """
     List files and directories at the given path.
@@ -120,38 +297,9 @@ def list_files(path: str = "/", webcontainer_state: Optional[dict] = None) -> To
 
     # Normalize path
     base_path = path.rstrip("/")
-    if not base_path:
-        base_path = ""
 
-    # Find all files/dirs at this level
-    entries: Dict[str, str] = {}  # name -> type
-
-    for file_path in files.keys():
-        # Normalize file path
-        norm_file_path = file_path if file_path.startswith("/") else f"/{file_path}"
-
-        # Check if file is under the requested path
-        if base_path and not norm_file_path.startswith(base_path + "/"):
-            if norm_file_path != base_path:
-                continue
-
-        # Get relative path
-        if base_path:
-            rel_path = norm_file_path[len(base_path):].lstrip("/")
-        else:
-            rel_path = norm_file_path.lstrip("/")
-
-        if not rel_path:
-            continue
-
-        # Get first component
-        parts = rel_path.split("/")
-        first = parts[0]
-
-        if len(parts) == 1:
-            entries[first] = "file"
-        else:
-            entries[first] = "directory"
+    # Children of this directory: name -> type
+    entries = _get_dir_index(files).get(base_path)
 
     if not entries:
         return ToolResult(
@@ -189,23 +337,20 @@ def file_exists(path: str, webcontainer_state: Optional[dict] = None) -> ToolRes
         )
 
     files = webcontainer_state.get("files", {})
-    normalized_path = path if path.startswith("/") else f"/{path}"
-    alt_path = path.lstrip("/")
+    normalized_path = _normalize_path(path)
 
-    if normalized_path in files or alt_path in files:
+    if normalized_path in files:
         return ToolResult(
             success=True,
             result=f"File exists: {path}"
         )
 
     # Check if it's a directory (any file starts with this path)
-    for file_path in files.keys():
-        norm_file = file_path if file_path.startswith("/") else f"/{file_path}"
-        if norm_file.startswith(normalized_path + "/"):
-            return ToolResult(
-                success=True,
-                result=f"Directory exists: {path}"
-            )
+    if normalized_path in _get_dir_set(files):
+        return ToolResult(
+            success=True,
+            result=f"Directory exists: {path}"
+        )
 
     return ToolResult(
         success=True,
@@ -213,6 +358,27 @@ def file_exists(path: str, webcontainer_state: Optional[dict] = None) -> ToolRes
     )
 
 
+# Single-slot cache of {terminal id: terminal} for the most recent terminals
+# list, which is also replaced wholesale on every frontend state update
+_terminal_index_cache: Optional[tuple] = None
+
+
+def _get_terminal_index(terminals: Sequence[dict]) -> Dict[Any, dict]:
+    """Return {id: terminal} for terminals; the first terminal wins on duplicate ids"""
+    global _terminal_index_cache
+
+    cached = _terminal_index_cache
+    if cached is not None and cached[0] is terminals and cached[1] == len(terminals):
+        return cached[2]
+
+    index: Dict[Any, dict] = {}
+    for t in terminals:
+        index.setdefault(t.get("id"), t)
+
+    _terminal_index_cache = (terminals, len(terminals), index)
+    return index
+
+
 def get_terminal_output(
     lines: int = 50,
     terminal_id: Optional[str] = None,
@@ -235,7 +401,7 @@ def get_terminal_output(
             result="WebContainer state not available"
         )
 
-    terminals = webcontainer_state.get("terminals", [])
+    terminals = webcontainer_state.get("terminals") or ()
 
     if not terminals:
         return ToolResult(
@@ -246,10 +412,7 @@ def get_terminal_output(
     # Find the target terminal
     target = None
     if terminal_id:
-        for t in terminals:
-            if t.get("id") == terminal_id:
-                target = t
-                break
+        target = _get_terminal_index(terminals).get(terminal_id)
         if not target:
             return ToolResult(
                 success=False,
@@ -277,6 +440,13 @@ def get_terminal_output(
     )
 
 
+# Last rendered status: (preview, status, preview_url, error, result).
+# The frontend state replaces the preview dict on every update, so its
+# identity plus the scalar fields pins the rendered output; ToolResult is
+# frozen, so the cached instance is shared safely.
+_preview_status_cache: Optional[tuple] = None
+
+
 def get_preview_status(webcontainer_state: Optional[dict] = None) -> ToolResult:
     """
     Get the current preview/dev server status.
@@ -298,15 +468,27 @@ def get_preview_status(webcontainer_state: Optional[dict] = None) -> ToolResult:
     preview = webcontainer_state.get("preview", {})
     error = webcontainer_state.get("error")
 
-    lines = [f"## Preview Status\n"]
-    lines.append(f"**WebContainer**: {status}")
+    global _preview_status_cache
+    cached = _preview_status_cache
+    if (
+        cached is not None
+        and cached[0] is preview
+        and cached[1] == status
+        and cached[2] == preview_url
+        and cached[3] == error
+    ):
+        return cached[4]
+
+    # Streamed into one buffer: no intermediate list + join per poll
+    buf = io.StringIO()
+    w = buf.write
+    w(f"## Preview Status\n\n**WebContainer**: {status}")
 
     if error:
-        lines.append(f"❌ **System Error**: {error}")
+        w(f"\n❌ **System Error**: {error}")
     elif preview_url:
         # Dev server IS running!
-        lines.append(f"✅ **Dev Server**: Running")
-        lines.append(f"🌐 **URL**: {preview_url}")
+        w(f"\n✅ **Dev Server**: Running\n🌐 **URL**: {preview_url}")
 
         # Check if preview iframe has loaded
         is_loading = preview.get("is_loading", False)
@@ -314,24 +496,85 @@ def get_preview_status(webcontainer_state: Optional[dict] = None) -> ToolResult:
         error_overlay = preview.get("error_overlay")
 
         if has_error:
-            lines.append(f"❌ **Preview**: Error (see get_preview_errors() for details)")
+            w("\n❌ **Preview**: Error (see get_preview_errors() for details)")
         elif is_loading:
-            lines.append(f"🔄 **Preview**: Loading...")
+            w("\n🔄 **Preview**: Loading...")
         elif error_overlay:
-            lines.append(f"❌ **Build Error**: Vite error overlay present (call get_preview_error_overlay())")
+            w("\n❌ **Build Error**: Vite error overlay present (call get_preview_error_overlay())")
         else:
-            lines.append(f"✅ **Preview**: Rendering normally")
+            w("\n✅ **Preview**: Rendering normally")
 
-        lines.append(f"\n💡 **Recommendation**: Since dev server is running, use diagnose_preview_state() for detailed analysis instead of repeatedly checking status.")
+        w("\n\n💡 **Recommendation**: Since dev server is running, use diagnose_preview_state() for detailed analysis instead of repeatedly checking status.")
     else:
         # Dev server NOT running
-        lines.append(f"⏳ **Dev Server**: Not started")
-        lines.append(f"\n💡 **Next Step**: Call start_dev_server() to start it (or it may auto-start if files are detected).")
+        w("\n⏳ **Dev Server**: Not started")
+        w("\n\n💡 **Next Step**: Call start_dev_server() to start it (or it may auto-start if files are detected).")
 
-    return ToolResult(
+    result = ToolResult(
         success=True,
-        result="\n".join(lines)
+        result=buf.getvalue()
     )
+    _preview_status_cache = (preview, status, preview_url, error, result)
+    return result
+
+
+def _format_path_tree(paths) -> List[str]:
+    """
+    Render paths as `tree`-style lines ("├── ", "└── ", "│   " prefixes).
+
+    Paths are split into component tuples and sorted, which yields the
+    depth-first, name-sorted node order directly. The list is then walked
+    in reverse: at that point every node's later siblings have already been
+    seen, so each line's connectors are known when it is emitted, without
+    building a nested-dict tree.
+    """
+    keys = sorted({tuple(path.lstrip("/").split("/")) for path in paths})
+
+    reversed_lines: List[str] = []
+    # has_later_sibling[d]: the current depth-d node has a later sibling
+    has_later_sibling: List[bool] = []
+    next_key: tuple = ()
+
+    for i in range(len(keys) - 1, -1, -1):
+        key = keys[i]
+        depth = len(key)
+
+        # Components shared with the following key keep their flags; the
+        # first differing component has a later sibling, deeper ones don't.
+        shared = 0
+        if next_key:
+            limit = min(depth, len(next_key))
+            while shared < limit and key[shared] == next_key[shared]:
+                shared += 1
+        del has_later_sibling[shared:]
+        if next_key and shared < depth:
+            has_later_sibling.append(True)
+        has_later_sibling.extend([False] * (depth - len(has_later_sibling)))
+
+        # Emit only the nodes not shared with the previous key
+        first_new = 0
+        if i > 0:
+            prev_key = keys[i - 1]
+            limit = min(depth, len(prev_key))
+            while first_new < limit and key[first_new] == prev_key[first_new]:
+                first_new += 1
+
+        for d in range(depth - 1, first_new - 1, -1):
+            prefix = "".join(
+                "│   " if has_later_sibling[a] else "    " for a in range(d)
+            )
+            connector = "├── " if has_later_sibling[d] else "└── "
+            reversed_lines.append(prefix + connector + key[d])
+
+        next_key = key
+
+    reversed_lines.reverse()
+    return reversed_lines
+
+
+# Last rendered tree: (files, len(files), result), same invalidation rule
+# as _dir_index_cache
+_project_structure_cache: Optional[tuple] = None
 
 
 def get_project_structure(webcontainer_state: Optional[dict] = None) -> ToolResult:
@@ -358,37 +601,19 @@ def get_project_structure(webcontainer_state: Optional[dict] = None) -> ToolResu
             result="Project is empty. No files have been created yet."
         )
 
-    # Build tree structure
-    def build_tree(paths: List[str]) -> Dict:
-        tree: Dict[str, Any] = {}
-        for path in paths:
-            parts = path.lstrip("/").split("/")
-            current = tree
-            for part in parts:
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
-        return tree
-
-    def format_tree(tree: Dict, prefix: str = "") -> List[str]:
-        lines = []
-        items = sorted(tree.items())
-        for i, (name, subtree) in enumerate(items):
-            is_last = i == len(items) - 1
-            connector = "└── " if is_last else "├── "
-            lines.append(prefix + connector + name)
-            if subtree:
-                extension = "    " if is_last else "│   "
-                lines.extend(format_tree(subtree, prefix + extension))
-        return lines
-
-    tree = build_tree(list(files.keys()))
-    tree_lines = format_tree(tree)
+    global _project_structure_cache
+    cached = _project_structure_cache
+    if cached is not None and cached[0] is files and cached[1] == len(files):
+        return cached[2]
 
-    return ToolResult(
+    tree_lines = _format_path_tree(files.keys())
+
+    result = ToolResult(
         success=True,
         result="Project Structure:\n" + "\n".join(tree_lines)
     )
+    _project_structure_cache = (files, len(files), result)
+    return result
 
 
 # ============================================
@@ -406,15 +631,9 @@ def write_file(path: str, content: str) -> ToolResult:
     Returns:
         ToolResult with action for frontend
     """
-    normalized_path = path if path.startswith("/") else f"/{path}"
+    normalized_path = _normalize_path(path)
 
-    action = {
-        "type": "write_file",
-        "payload": {
-            "path": normalized_path,
-            "content": content
-        }
-    }
+    action = _action("write_file", path=normalized_path, content=content)
 
     return ToolResult(
         success=True,
@@ -433,14 +652,9 @@ def delete_file(path: str) -> ToolResult:
     Returns:
         ToolResult with action for frontend
     """
-    normalized_path = path if path.startswith("/") else f"/{path}"
+    normalized_path = _normalize_path(path)
 
-    action = {
-        "type": "delete_file",
-        "payload": {
-            "path": normalized_path
-        }
-    }
+    action = _action("delete_file", path=normalized_path)
 
     return ToolResult(
         success=True,
@@ -459,14 +673,9 @@ def create_directory(path: str) -> ToolResult:
     Returns:
         ToolResult with action for frontend
     """
-    normalized_path = path if path.startswith("/") else f"/{path}"
+    normalized_path = _normalize_path(path)
 
-    action = {
-        "type": "create_directory",
-        "payload": {
-            "path": normalized_path
-        }
-    }
+    action = _action("create_directory", path=normalized_path)
 
     return ToolResult(
         success=True,
@@ -492,13 +701,7 @@ def run_command(command: str, args: Optional[List[str]] = None) -> ToolResult:
     """
     args = args or []
 
-    action = {
-        "type": "run_command",
-        "payload": {
-            "command": command,
-            "args": args
-        }
-    }
+    action = _action("run_command", command=command, args=args)
 
     cmd_str = f"{command} {' '.join(args)}".strip()
     return ToolResult(
@@ -519,13 +722,7 @@ def install_dependencies(packages: List[str], dev: bool = False) -> ToolResult:
     Returns:
         ToolResult with action for frontend
     """
-    action = {
-        "type": "install_dependencies",
-        "payload": {
-            "packages": packages,
-            "dev": dev
-        }
-    }
+    action = _action("install_dependencies", packages=packages, dev=dev)
 
     if packages:
         pkg_str = ", ".join(packages)
@@ -548,10 +745,7 @@ def start_dev_server() -> ToolResult:
     Returns:
         ToolResult with action for frontend
     """
-    action = {
-        "type": "start_dev_server",
-        "payload": {}
-    }
+    action = _action("start_dev_server")
 
     return ToolResult(
         success=True,
@@ -567,10 +761,7 @@ def stop_server() -> ToolResult:
     Returns:
         ToolResult with action for frontend
     """
-    action = {
-        "type": "stop_process",
-        "payload": {}
-    }
+    action = _action("stop_process")
 
     return ToolResult(
         success=True,
@@ -594,30 +785,26 @@ def create_terminal(name: Optional[str] = None, webcontainer_state: Optional[dic
     Returns:
         ToolResult with action to create terminal
     """
+    terminal_count = 0
     if webcontainer_state:
-        terminals = webcontainer_state.get("terminals", [])
-        if len(terminals) >= MAX_TERMINALS:
+        terminals = webcontainer_state.get("terminals") or ()
+        terminal_count = len(terminals)
+        if terminal_count >= MAX_TERMINALS:
             return ToolResult(
                 success=False,
                 result=f"Maximum number of terminals ({MAX_TERMINALS}) reached. Close an existing terminal first."
             )
 
         # Check for duplicate name
-        if name:
-            existing_names = [t.get("name", "") for t in terminals]
-            if name in existing_names:
-                name = f"{name}-{len(terminals) + 1}"
-
-    action = {
-        "type": "create_terminal",
-        "payload": {
-            "name": name or f"Terminal {len(webcontainer_state.get('terminals', [])) + 1 if webcontainer_state else 1}"
-        }
-    }
+        if name and any(t.get("name", "") == name for t in terminals):
+            name = f"{name}-{terminal_count + 1}"
+
+    name = name or f"Terminal {terminal_count + 1}"
+    action = _action("create_terminal", name=name)
 
     return ToolResult(
         success=True,
-        result=f"Creating new terminal: {action['payload']['name']}",
+        result=f"Creating new terminal: {name}",
         action=action
     )
 
@@ -638,7 +825,7 @@ def list_terminals(webcontainer_state: Optional[dict] = None) -> ToolResult:
             result="WebContainer state not available"
         )
 
-    terminals = webcontainer_state.get("terminals", [])
+    terminals = webcontainer_state.get("terminals") or ()
 
     if not terminals:
         return ToolResult(
@@ -650,12 +837,14 @@ def list_terminals(webcontainer_state: Optional[dict] = None) -> ToolResult:
     active_id = webcontainer_state.get("active_terminal_id")
 
     for t in terminals:
+        # Each field is read once per row
+        tid = t.get("id", "unknown")
         status = "🟢 Running" if t.get("is_running") else "⚫ Idle"
-        active = " (active)" if t.get("id") == active_id else ""
-        name = t.get("name", t.get("id", "unknown"))
-        cmd = t.get("command", "")
+        active = " (active)" if tid == active_id else ""
+        name = t.get("name", tid)
+        cmd = t.get("command")
         cmd_str = f" - {cmd}" if cmd else ""
-        lines.append(f"  [{t.get('id', 'unknown')}] {name}{active}: {status}{cmd_str}")
+        lines.append(f"  [{tid}] {name}{active}: {status}{cmd_str}")
 
     return ToolResult(
         success=True,
@@ -680,21 +869,16 @@ def switch_terminal(terminal_id: str, webcontainer_state: Optional[dict] = None)
             result="WebContainer state not available"
         )
 
-    terminals = webcontainer_state.get("terminals", [])
-    terminal_ids = [t.get("id") for t in terminals]
+    terminals = webcontainer_state.get("terminals") or ()
 
-    if terminal_id not in terminal_ids:
+    if terminal_id not in _get_terminal_index(terminals):
+        terminal_ids = [t.get("id") for t in terminals]
         return ToolResult(
             success=False,
             result=f"Terminal '{terminal_id}' not found. Available: {terminal_ids}"
         )
 
-    action = {
-        "type": "switch_terminal",
-        "payload": {
-            "terminal_id": terminal_id
-        }
-    }
+    action = _action("switch_terminal", terminal_id=terminal_id)
 
     return ToolResult(
         success=True,
@@ -725,15 +909,10 @@ def send_terminal_input(
             result="WebContainer state not available"
         )
 
-    terminals = webcontainer_state.get("terminals", [])
-    target = None
-    for t in terminals:
-        if t.get("id") == terminal_id:
-            target = t
-            break
+    terminals = webcontainer_state.get("terminals") or ()
+    target = _get_terminal_index(terminals).get(terminal_id)
 
     if not target:
-        terminal_ids = [t.get("id") for t in terminals]
         terminal_details = []
         for t in terminals:
             tid = t.get("id", "unknown")
@@ -755,16 +934,17 @@ def send_terminal_input(
             result=f"Terminal '{terminal_id}' has no running process. Use run_command to start one."
         )
 
-    # Process escape sequences
-    processed_input = input_text.replace("\\n", "\n").replace("\\x03", "\x03")
+    # Process escape sequences (most input has no backslash at all)
+    if "\\" in input_text:
+        processed_input = input_text.replace("\\n", "\n").replace("\\x03", "\x03")
+    else:
+        processed_input = input_text
 
-    action = {
-        "type": "send_terminal_input",
-        "payload": {
-            "terminal_id": terminal_id,
-            "input": processed_input
-        }
-    }
+    action = _action(
+        "send_terminal_input",
+        terminal_id=terminal_id,
+        input=processed_input
+    )
 
     return ToolResult(
         success=True,
@@ -790,21 +970,16 @@ def kill_terminal(terminal_id: str, webcontainer_state: Optional[dict] = None) -
             result="WebContainer state not available"
         )
 
-    terminals = webcontainer_state.get("terminals", [])
-    terminal_ids = [t.get("id") for t in terminals]
+    terminals = webcontainer_state.get("terminals") or ()
 
-    if terminal_id not in terminal_ids:
+    if terminal_id not in _get_terminal_index(terminals):
+        terminal_ids = [t.get("id") for t in terminals]
         return ToolResult(
             success=False,
             result=f"Terminal '{terminal_id}' not found. Available: {terminal_ids}"
         )
 
-    action = {
-        "type": "kill_terminal",
-        "payload": {
-            "terminal_id": terminal_id
-        }
-    }
+    action = _action("kill_terminal", terminal_id=terminal_id)
 
     return ToolResult(
         success=True,
@@ -837,7 +1012,7 @@ def get_terminal_history(
             result="WebContainer state not available"
         )
 
-    terminals = webcontainer_state.get("terminals", [])
+    terminals = webcontainer_state.get("terminals") or ()
 
     if not terminals:
         return ToolResult(
@@ -848,10 +1023,7 @@ def get_terminal_history(
     # Find target terminal
     target = None
     if terminal_id:
-        for t in terminals:
-            if t.get("id") == terminal_id:
-                target = t
-                break
+        target = _get_terminal_index(terminals).get(terminal_id)
         if not target:
             return ToolResult(
                 success=False,
@@ -861,10 +1033,7 @@ def get_terminal_history(
         # Use active terminal or first one
         active_id = webcontainer_state.get("active_terminal_id")
         if active_id:
-            for t in terminals:
-                if t.get("id") == active_id:
-                    target = t
-                    break
+            target = _get_terminal_index(terminals).get(active_id)
         if not target:
             target = terminals[0]
 
@@ -876,28 +1045,35 @@ def get_terminal_history(
             result=f"Terminal '{target.get('id')}' has no output history."
         )
 
-    # Extract text from history
-    output_lines = []
-    for entry in history:
-        if isinstance(entry, dict):
-            data = entry.get("data", "")
-        else:
-            data = str(entry)
-        output_lines.extend(data.split("\n"))
-
     # Apply search filter if provided
+    pattern = None
     if search:
         try:
-            pattern = re.compile(search, re.IGNORECASE)
-            output_lines = [line for line in output_lines if pattern.search(line)]
+            pattern = _compile_search_pattern(search)
         except re.error as e:
             return ToolResult(
                 success=False,
                 result=f"Invalid search pattern: {e}"
             )
 
-    # Limit lines
+    # Extract text from history, newest entry first, stopping once one more
+    # (filtered) line than can be shown has been collected
     lines = min(lines, MAX_HISTORY_LINES)
+    wanted = lines + 1 if lines > 0 else None
+    output_lines = []
+    for entry in reversed(history):
+        if isinstance(entry, dict):
+            data = entry.get("data", "")
+        else:
+            data = str(entry)
+        for line in reversed(data.split("\n")):
+            if pattern is None or pattern.search(line):
+                output_lines.append(line)
+        if wanted is not None and len(output_lines) >= wanted:
+            break
+    output_lines.reverse()
+
+    # Limit lines
     if len(output_lines) > lines:
         output_lines = output_lines[-lines:]
         truncated = True
@@ -912,7 +1088,7 @@ def get_terminal_history(
     if search:
         header += f" [filtered by: {search}]"
 
-    result = header + "\n" + "-" * 40 + "\n" + "\n".join(output_lines)
+    result = _format_listing(header, output_lines)
 
     return ToolResult(
         success=True,
@@ -950,19 +1126,15 @@ def edit_file(
             result="WebContainer state not available"
         )
 
-    normalized_path = path if path.startswith("/") else f"/{path}"
-    files = webcontainer_state.get("files", {})
-
     # Check file exists
-    if normalized_path not in files and path not in files:
-        available = list(files.keys())[:10]
+    normalized_path, files, content = _lookup_file(webcontainer_state, path)
+    if content is None:
+        available = list(islice(files, 10))
         return ToolResult(
             success=False,
             result=f"File not found: {path}. Available files: {available}"
         )
 
-    content = files.get(normalized_path) or files.get(path)
-
     # Check if old_text exists
     if old_text not in content:
         # Try to find similar text for helpful error
@@ -977,26 +1149,30 @@ def edit_file(
     count = content.count(old_text)
 
     if count > 1 and not replace_all:
-        # Find line numbers of occurrences
+        # Find line numbers of occurrences (offset scan, no line list)
         line_nums = []
-        for i, line in enumerate(content.split("\n"), 1):
-            if old_text in line:
-                line_nums.append(i)
+        line_no = 1
+        counted_to = 0
+        pos = content.find(old_text)
+        while pos != -1:
+            line_no += content.count("\n", counted_to, pos)
+            counted_to = pos
+            if not line_nums or line_nums[-1] != line_no:
+                line_nums.append(line_no)
+            pos = content.find(old_text, pos + len(old_text))
 
         return ToolResult(
             success=False,
             result=f"Found {count} occurrences of the text at lines {line_nums}. Use replace_all=true to replace all, or provide more context to make the match unique."
         )
 
-    action = {
-        "type": "edit_file",
-        "payload": {
-            "path": normalized_path,
-            "old_text": old_text,
-            "new_text": new_text,
-            "replace_all": replace_all
-        }
-    }
+    action = _action(
+        "edit_file",
+        path=normalized_path,
+        old_text=old_text,
+        new_text=new_text,
+        replace_all=replace_all
+    )
 
     replaced_count = count if replace_all else 1
     return ToolResult(
@@ -1024,32 +1200,26 @@ def rename_file(old_path: str, new_path: str, webcontainer_state: Optional[dict]
             result="WebContainer state not available"
         )
 
-    old_normalized = old_path if old_path.startswith("/") else f"/{old_path}"
-    new_normalized = new_path if new_path.startswith("/") else f"/{new_path}"
+    old_normalized = _normalize_path(old_path)
+    new_normalized = _normalize_path(new_path)
 
     files = webcontainer_state.get("files", {})
 
     # Check source exists
-    if old_normalized not in files and old_path not in files:
+    if old_normalized not in files:
         return ToolResult(
             success=False,
             result=f"Source file not found: {old_path}"
         )
 
     # Check destination doesn't exist
-    if new_normalized in files or new_path in files:
+    if new_normalized in files:
         return ToolResult(
             success=False,
             result=f"Destination file already exists: {new_path}. Delete it first or choose a different name."
         )
 
-    action = {
-        "type": "rename_file",
-        "payload": {
-            "old_path": old_normalized,
-            "new_path": new_normalized
-        }
-    }
+    action = _action("rename_file", old_path=old_normalized, new_path=new_normalized)
 
     return ToolResult(
         success=True,
@@ -1058,6 +1228,132 @@ def rename_file(old_path: str, new_path: str, webcontainer_state: Optional[dict]
     )
 
 
+# ASCII characters that str patterns treat as whitespace (\s) but bytes
+# patterns do not; content containing them is scanned as str
+_STR_ONLY_SPACE = re.compile("[\x1c-\x1f]")
+
+
+# A whole-content scan finds every line regex.search(line) accepts only if
+# each path the regex can take through the line is still open on the whole
+# content: the "\n" around the line merely adds paths (then rejected by the
+# per-line confirm). That holds for plain backtracking constructs. It fails
+# for \A / \Z, which stop matching at line boundaries, and for anything that
+# commits to a match without backtracking into it -- lookarounds (which also
+# see the neighbouring "\n"), atomic groups and possessive quantifiers (which
+# can swallow the "\n" and never give it back). So the scan is only used for
+# patterns whose "(?" groups are all on an allow-list and that use none of
+# the other constructs; everything else is matched line by line.
+_SCAN_UNSAFE = re.compile(r"\\[AZz]|[*+?}]\+")
+_SCAN_SAFE_GROUP = re.compile(r"\(\?(?::|P<|P=|#|[aiLmsu-]+[:)])")
+
+
+def _compile_line_scan(pattern: str) -> Optional[re.Pattern]:
+    """
+    MULTILINE form of a search pattern for _iter_matching_lines, or None
+    if the pattern must be matched line by line (see _SCAN_UNSAFE).
+    Escapes and character classes are not parsed, so "\\++" or "[(?=]"
+    also fall back; that only costs speed.
+    """
+    if _SCAN_UNSAFE.search(pattern):
+        return None
+    if pattern.count("(?") != len(_SCAN_SAFE_GROUP.findall(pattern)):
+        return None
+    return _compile_search_pattern(pattern, re.IGNORECASE | re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_ascii_scan(pattern: str) -> Optional[re.Pattern]:
+    """
+    Bytes version of a search scan pattern, or None if the pattern cannot
+    be expressed as ASCII bytes (non-ASCII text, \\u escapes, (?u), ...).
+    ASCII case folding on bytes is cheaper than Unicode folding on str.
+    """
+    if not pattern.isascii():
+        return None
+    try:
+        return re.compile(pattern.encode("ascii"), re.IGNORECASE | re.MULTILINE)
+    except re.error:
+        return None
+
+
+def _iter_matching_lines(
+    content: str,
+    regex: re.Pattern,
+    scan: Optional[re.Pattern],
+    ascii_scan: Optional[re.Pattern] = None,
+):
+    """
+    Yield (line_number, line, line_start) for every line of content that
+    regex matches; line_start is the line's offset in content.
+
+    scan is the same pattern compiled with re.MULTILINE; it runs over the
+    whole content so non-matching lines are skipped inside the regex engine
+    instead of one Python iteration per line. Each candidate line is then
+    confirmed with regex, so the reported lines are exactly those for which
+    regex.search(line) succeeds.
+
+    For pure-ASCII content, ascii_scan (the bytes form of scan) is run over
+    the encoded content instead; byte and character offsets coincide.
+
+    With scan None (see _compile_line_scan) every line is matched on its own.
+    """
+    if scan is None:
+        line_start = 0
+        for line_no, line in enumerate(content.split("\n"), 1):
+            if regex.search(line):
+                yield line_no, line, line_start
+            line_start += len(line) + 1
+        return
+
+    end = len(content)
+    line_no = 1
+    counted_to = 0
+    pos = 0
+
+    haystack = content
+    if ascii_scan is not None and content.isascii() and not _STR_ONLY_SPACE.search(content):
+        haystack = content.encode("ascii")
+        scan = ascii_scan
+
+    while pos <= end:
+        m = scan.search(haystack, pos)
+        if m is None:
+            return
+
+        start = m.start()
+        line_start = content.rfind("\n", 0, start) + 1 if start > pos else pos
+        line_end = content.find("\n", start)
+        if line_end == -1:
+            line_end = end
+
+        line = content[line_start:line_end]
+        if regex.search(line):
+            line_no += content.count("\n", counted_to, line_start)
+            counted_to = line_start
+            yield line_no, line, line_start
+
+        pos = line_end + 1
+
+
+def _line_window(content: str, line_start: int, line_end: int, before: int, after: int) -> List[str]:
+    """
+    The line spanning [line_start, line_end) plus up to `before` / `after`
+    neighbouring lines, located with rfind/find around it (the caller
+    guarantees the neighbours exist).
+    """
+    begin = line_start
+    for _ in range(before):
+        begin = content.rfind("\n", 0, begin - 1) + 1
+
+    stop = line_end
+    for _ in range(after):
+        stop = content.find("\n", stop + 1)
+        if stop == -1:
+            stop = len(content)
+
+    return content[begin:stop].split("\n")
+
+
 def search_in_file(
     path: str,
     pattern: str,
@@ -1082,10 +1378,7 @@ def search_in_file(
             result="WebContainer state not available"
         )
 
-    normalized_path = path if path.startswith("/") else f"/{path}"
-    files = webcontainer_state.get("files", {})
-
-    content = files.get(normalized_path) or files.get(path)
+    _, _, content = _lookup_file(webcontainer_state, path)
     if content is None:
         return ToolResult(
             success=False,
@@ -1093,7 +1386,7 @@ def search_in_file(
         )
 
     try:
-        regex = re.compile(pattern, re.IGNORECASE)
+        regex = _compile_search_pattern(pattern)
     except re.error as e:
         return ToolResult(
             success=False,
@@ -1103,57 +1396,62 @@ def search_in_file(
     # Clamp context to 0-5 range
     context = max(0, min(5, context))
 
-    lines = content.split("\n")
-    total_lines = len(lines)
+    total_lines = content.count("\n") + 1
 
-    # Find all matching line indices (0-based)
-    match_indices = []
-    for i, line in enumerate(lines):
-        if regex.search(line):
-            match_indices.append(i)
+    # Find all matching lines as (0-based index, line, offset); content is
+    # scanned in place, only matching lines are sliced out
+    scan = _compile_line_scan(pattern)
+    matches = [
+        (line_no - 1, line, line_start)
+        for line_no, line, line_start in _iter_matching_lines(
+            content, regex, scan, _compile_ascii_scan(pattern)
+        )
+    ]
 
-    if not match_indices:
+    if not matches:
         return ToolResult(
             success=True,
             result=f"No matches found for '{pattern}' in {path}"
         )
 
-    # Build output with context
+    # Build output with context. Matches (and so their context windows) are
+    # in ascending order, so everything up to last_shown has been emitted
+    # already and only the part of each window past it is new.
     output_parts = []
-    shown_lines = set()  # Track which lines have been shown to avoid duplicates
+    last_shown = -1
 
-    for match_idx in match_indices[:MAX_SEARCH_RESULTS]:
+    for match_idx, line, line_start in matches[:MAX_SEARCH_RESULTS]:
         # Calculate context range
         start = max(0, match_idx - context)
         end = min(total_lines, match_idx + context + 1)
 
         # Add separator if there's a gap from previous output
-        if shown_lines and start > max(shown_lines) + 1:
+        if last_shown >= 0 and start > last_shown + 1:
             output_parts.append("  ---")
 
-        # Add context lines before, match line, and context lines after
-        for i in range(start, end):
-            if i not in shown_lines:
-                line_num = i + 1  # 1-based line number
-                line_content = lines[i].rstrip()
-
-                if i == match_idx:
-                    # Highlight matching line with arrow
-                    output_parts.append(f"→ L{line_num}: {line_content}")
-                else:
-                    # Context line
-                    output_parts.append(f"  L{line_num}: {line_content}")
-
-                shown_lines.add(i)
-
-    match_count = len(match_indices)
-    truncated = ""
+        # Add context lines before, match line (with arrow), and context
+        # lines after; line numbers are 1-based
+        first = max(start, last_shown + 1)
+        if first < end:
+            window = _line_window(
+                content, line_start, line_start + len(line),
+                max(0, match_idx - first), end - 1 - match_idx,
+            )
+            if first > match_idx:
+                window = window[first - match_idx:]
+            output_parts.extend([
+                f"{'→' if i == match_idx else ' '} L{i + 1}: {text.rstrip()}"
+                for i, text in enumerate(window, first)
+            ])
+        last_shown = max(last_shown, end - 1)
+
+    match_count = len(matches)
     if match_count > MAX_SEARCH_RESULTS:
-        truncated = f"\n... and {match_count - MAX_SEARCH_RESULTS} more matches"
+        output_parts.append(f"... and {match_count - MAX_SEARCH_RESULTS} more matches")
 
     return ToolResult(
         success=True,
-        result=f"Found {match_count} matches in {path}:\n" + "\n".join(output_parts) + truncated
+        result="\n".join([f"Found {match_count} matches in {path}:", *output_parts])
     )
 
 
@@ -1188,49 +1486,56 @@ def search_in_project(
         )
 
     try:
-        regex = re.compile(pattern, re.IGNORECASE)
+        regex = _compile_search_pattern(pattern)
     except re.error as e:
         return ToolResult(
             success=False,
             result=f"Invalid regex pattern: {e}"
         )
-
-    # Filter files by pattern
-    matched_files = []
-    for file_path in files.keys():
-        # Normalize path for matching
-        normalized = file_path.lstrip("/")
-
-        # Skip node_modules by default
-        if "node_modules" in normalized:
-            continue
-
-        # Apply glob pattern
-        if file_pattern != "*":
-            if not fnmatch.fnmatch(normalized, file_pattern):
-                continue
-
-        matched_files.append(file_path)
+    scan = _compile_line_scan(pattern)
+    ascii_scan = _compile_ascii_scan(pattern)
+
+    # Filter files by pattern (node_modules is already excluded by the
+    # index). "*.ext" only needs that extension's files ("*" also crosses
+    # "/", so the match is just the path suffix).
+    searchable, by_ext = _get_search_index(files)
+    ext_glob = _SIMPLE_EXT_GLOB.fullmatch(file_pattern)
+    if file_pattern == "*":
+        matched_files = [file_path for file_path, _ in searchable]
+    elif ext_glob:
+        matched_files = by_ext.get(ext_glob.group(1), ())
+    else:
+        glob_match = _compile_glob(file_pattern)
+        matched_files = [
+            file_path for file_path, rel_path in searchable
+            if glob_match(rel_path) is not None
+        ]
 
     # Search in matched files
     results = []
     total_matches = 0
 
     for file_path in matched_files:
-        content = files[file_path]
-        lines = content.split("\n")
+        if len(results) > MAX_SEARCH_RESULTS:
+            # Output is already past the truncation point; only the total
+            # match count is still needed, so skip formatting
+            total_matches += sum(1 for _ in _iter_matching_lines(files[file_path], regex, scan, ascii_scan))
+            continue
+
         file_matches = []
+        match_count = 0
 
-        for i, line in enumerate(lines, 1):
-            if regex.search(line):
+        for i, line, _ in _iter_matching_lines(files[file_path], regex, scan, ascii_scan):
+            match_count += 1
+            if match_count <= 5:  # Max 5 matches per file
                 file_matches.append(f"    L{i}: {line.strip()[:80]}")
-                total_matches += 1
 
-        if file_matches:
+        if match_count:
+            total_matches += match_count
             results.append(f"  {file_path}:")
-            results.extend(file_matches[:5])  # Max 5 matches per file
-            if len(file_matches) > 5:
-                results.append(f"    ... and {len(file_matches) - 5} more matches")
+            results.extend(file_matches)
+            if match_count > 5:
+                results.append(f"    ... and {match_count - 5} more matches")
 
     if not results:
         return ToolResult(
@@ -1244,10 +1549,31 @@ def search_in_project(
 
     return ToolResult(
         success=True,
-        result=f"Found {total_matches} matches across project:\n" + "\n".join(results)
+        result="\n".join([f"Found {total_matches} matches across project:", *results])
     )
 
 
+def _line_start_offset(content: str, line_no: int, total_lines: int) -> int:
+    """
+    Offset of the first character of line line_no (1-based) in content.
+
+    Walks newlines with str.find / str.rfind from whichever end of the file
+    is closer, so no per-line strings are allocated.
+    """
+    if line_no - 1 <= total_lines - line_no:
+        find = content.find
+        pos = 0
+        for _ in range(line_no - 1):
+            pos = find("\n", pos) + 1
+        return pos
+
+    rfind = content.rfind
+    pos = len(content)
+    for _ in range(total_lines - line_no + 1):
+        pos = rfind("\n", 0, pos)
+    return pos + 1
+
+
 def read_lines(
     path: str,
     start_line: int,
@@ -1283,18 +1609,14 @@ def read_lines(
             result="WebContainer state not available"
         )
 
-    normalized_path = path if path.startswith("/") else f"/{path}"
-    files = webcontainer_state.get("files", {})
-
-    content = files.get(normalized_path) or files.get(path)
+    _, _, content = _lookup_file(webcontainer_state, path)
     if content is None:
         return ToolResult(
             success=False,
             result=f"File not found: {path}"
         )
 
-    lines = content.split("\n")
-    total_lines = len(lines)
+    total_lines = content.count("\n") + 1
 
     # Validate start_line
     if start_line < 1:
@@ -1324,12 +1646,19 @@ def read_lines(
     if end_line - start_line + 1 > max_lines:
         end_line = start_line + max_lines - 1
 
-    # Extract lines (convert to 0-based index)
-    output_parts = []
-    for i in range(start_line - 1, end_line):
-        line_num = i + 1
-        line_content = lines[i].rstrip()
-        output_parts.append(f"L{line_num}: {line_content}")
+    # Extract only the requested lines: slice their span out of content
+    # (end_line <= total_lines, so only the last line can lack a "\n")
+    begin = _line_start_offset(content, start_line, total_lines)
+    stop = begin
+    for _ in range(end_line - start_line + 1):
+        stop = content.find("\n", stop) + 1
+        if not stop:
+            stop = len(content) + 1
+            break
+    output_parts = [
+        f"L{line_num}: {line.rstrip()}"
+        for line_num, line in enumerate(content[begin:stop - 1].split("\n"), start_line)
+    ]
 
     lines_read = end_line - start_line + 1
     header = f"{path} (lines {start_line}-{end_line} of {total_lines}):\n"
@@ -1388,13 +1717,7 @@ def take_screenshot(
             result=f"Preview has an error: {error_msg}. Fix the error first."
         )
 
-    action = {
-        "type": "take_screenshot",
-        "payload": {
-            "selector": selector,
-            "full_page": full_page
-        }
-    }
+    action = _action("take_screenshot", selector=selector, full_page=full_page)
 
     target = f"element '{selector}'" if selector else ("full page" if full_page else "viewport")
     return ToolResult(
@@ -1404,6 +1727,61 @@ def take_screenshot(
     )
 
 
+# Single-slot cache of {type: [messages]} for the most recent console_messages
+# list, which is also replaced wholesale on every frontend state update
+_console_partition_cache: Optional[tuple] = None
+
+
+def _partition_console(console_messages: Sequence[dict]) -> Dict[Any, List[dict]]:
+    """Return console_messages bucketed by their "type", each bucket in original order"""
+    global _console_partition_cache
+
+    cached = _console_partition_cache
+    if cached is not None and cached[0] is console_messages and cached[1] == len(console_messages):
+        return cached[2]
+
+    partition: Dict[Any, List[dict]] = {}
+    for m in console_messages:
+        msg_type = m.get("type")
+        bucket = partition.get(msg_type)
+        if bucket is None:
+            partition[msg_type] = [m]
+        else:
+            bucket.append(m)
+
+    _console_partition_cache = (console_messages, len(console_messages), partition)
+    return partition
+
+
+def _console_tail(console_messages: Sequence[dict], n: int) -> Sequence[dict]:
+    """
+    Return the last n console messages, oldest first.
+
+    Producers may keep console_messages in a deque(maxlen=...) ring buffer;
+    its tail is read from the right end without copying the rest.
+    """
+    if not isinstance(console_messages, deque):
+        return console_messages[-n:]
+    if n <= 0:
+        return list(console_messages)[-n:]
+    tail = list(islice(reversed(console_messages), n))
+    tail.reverse()
+    return tail
+
+
+def _truncate_join(args, limit: int = 200) -> str:
+    """Return " ".join(str(arg) for arg in args)[:limit], stringifying only the args that fit"""
+    parts = []
+    size = -1
+    for arg in args:
+        text = str(arg)
+        parts.append(text)
+        size += len(text) + 1
+        if size >= limit:
+            break
+    return " ".join(parts)[:limit]
+
+
 def get_preview_errors(webcontainer_state: Optional[dict] = None) -> ToolResult:
     """
     Get detailed error information from the preview iframe.
@@ -1441,24 +1819,23 @@ def get_preview_errors(webcontainer_state: Optional[dict] = None) -> ToolResult:
             errors_found.append(f"🔴 Build Error (Vite): {overlay_msg[:300]}")
         if overlay_stack:
             # Extract file path and line number from stack
-            stack_lines = overlay_stack.split("\n")[:5]
+            stack_lines = islice(_iter_lines(overlay_stack), 5)
             errors_found.append("   Stack trace:")
             for line in stack_lines:
                 errors_found.append(f"      {line.strip()}")
 
     # Check console messages for errors
     console_messages = preview.get("console_messages", [])
-    error_msgs = [m for m in console_messages if m.get("type") == "error"]
+    error_msgs = _partition_console(console_messages).get("error", ())
 
     if error_msgs:
         errors_found.append(f"\n🔴 Console Errors ({len(error_msgs)} found):")
         for msg in error_msgs[-3:]:  # Last 3 errors
-            args = msg.get("args", [])
-            content = " ".join(str(arg) for arg in args)[:200]
+            content = _truncate_join(msg.get("args", []), 200)
             errors_found.append(f"   • {content}")
             stack = msg.get("stack", "")
             if stack:
-                first_line = stack.split("\n")[0]
+                first_line = stack.partition("\n")[0]
                 errors_found.append(f"     {first_line}")
 
     if not errors_found:
@@ -1519,15 +1896,16 @@ def get_console_messages(
 
     # Filter by types
     if types:
-        valid_types = {"log", "warn", "error", "info", "debug"}
-        types = [t for t in types if t in valid_types]
-        if types:
+        types = [t for t in types if t in _VALID_CONSOLE_TYPES]
+        if len(types) == 1:
+            messages = _partition_console(messages).get(types[0], [])
+        elif types:
             messages = [m for m in messages if m.get("type") in types]
 
     # Limit
     limit = min(limit, MAX_CONSOLE_MESSAGES)
     if len(messages) > limit:
-        messages = messages[-limit:]
+        messages = _console_tail(messages, limit)
         truncated = True
     else:
         truncated = False
@@ -1540,22 +1918,15 @@ def get_console_messages(
 
     # Format messages
     lines = []
-    type_icons = {
-        "log": "📝",
-        "info": "ℹ️",
-        "warn": "⚠️",
-        "error": "❌",
-        "debug": "🔍"
-    }
-
     for msg in messages:
-        icon = type_icons.get(msg.get("type", "log"), "📝")
-        msg_type = msg.get("type", "log").upper()
+        msg_type = msg.get("type", "log")
+        icon = _TYPE_ICONS.get(msg_type, "📝")
+        msg_type = msg_type.upper()
         args = msg.get("args", [])
 
-        # Format args
+        # Format args, keeping one extra character to tell if it was truncated
         try:
-            content = " ".join(str(arg) for arg in args)
+            content = _truncate_join(args, 201)
         except Exception:
             content = str(args)
 
@@ -1567,7 +1938,7 @@ def get_console_messages(
 
         # Include stack for errors
         if msg.get("stack") and msg.get("type") == "error":
-            stack_lines = msg["stack"].split("\n")[:3]
+            stack_lines = islice(_iter_lines(msg["stack"]), 3)
             for sl in stack_lines:
                 lines.append(f"      {sl.strip()}")
 
@@ -1579,7 +1950,7 @@ def get_console_messages(
 
     return ToolResult(
         success=True,
-        result=header + "\n" + "-" * 40 + "\n" + "\n".join(lines)
+        result=_format_listing(header, lines)
     )
 
 
@@ -1613,13 +1984,11 @@ def get_preview_dom(
             result="Preview is not available. Start the dev server first."
         )
 
-    action = {
-        "type": "get_preview_dom",
-        "payload": {
-            "selector": selector,
-            "depth": min(depth, 10)  # Cap depth at 10
-        }
-    }
+    action = _action(
+        "get_preview_dom",
+        selector=selector,
+        depth=min(depth, 10)  # Cap depth at 10
+    )
 
     return ToolResult(
         success=True,
@@ -1638,10 +2007,7 @@ def clear_console(webcontainer_state: Optional[dict] = None) -> ToolResult:
     Returns:
         ToolResult with action for frontend
     """
-    action = {
-        "type": "clear_console",
-        "payload": {}
-    }
+    action = _action("clear_console")
 
     return ToolResult(
         success=True,
@@ -1654,6 +2020,56 @@ def clear_console(webcontainer_state: Optional[dict] = None) -> ToolResult:
 # Diagnostic Tools
 # ============================================
 
+# Terminal output patterns checked by verify_changes, in priority order
+_TERMINAL_ERROR_PATTERNS = (
+    ("error:", "Build/compile error"),
+    ("syntaxerror", "Syntax error"),
+    ("typeerror", "Type error"),
+    ("referenceerror", "Reference error (undefined variable)"),
+    ("cannot find module", "Missing module/import"),
+    ("module not found", "Module not found"),
+    ("failed to compile", "Compilation failed"),
+    ("enoent", "File not found"),
+    ("permission denied", "Permission error"),
+    ("npm err!", "NPM error"),
+    ("error: expected", "Parse error"),
+)
+
+# Matches a line containing any of the patterns above, so only those lines
+# need the per-pattern priority check
+_TERMINAL_ERROR_RE = re.compile(
+    "|".join(re.escape(pattern) for pattern, _ in _TERMINAL_ERROR_PATTERNS),
+    re.IGNORECASE
+)
+
+# Vite overlay messages that mean an import points at a missing file
+_IMPORT_HINTS = ("Failed to resolve import", "Cannot find module")
+
+
+def _iter_recent_output(terminal: dict):
+    """Yield the last 30 history entries, then the last 20 last_output lines, of a terminal"""
+    for entry in terminal.get("history", [])[-30:]:
+        if isinstance(entry, dict):
+            yield entry.get("data", "")
+        else:
+            yield str(entry)
+    last_output = terminal.get("last_output", [])
+    if last_output:
+        yield from last_output[-20:]
+
+
+def _iter_lines(text: str):
+    """Yield the "\n"-separated lines of text lazily, like text.split("\n")"""
+    start = 0
+    while True:
+        end = text.find("\n", start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
 def verify_changes(webcontainer_state: Optional[dict] = None) -> ToolResult:
     """
     Verify if recent changes caused any errors.
@@ -1682,47 +2098,21 @@ def verify_changes(webcontainer_state: Optional[dict] = None) -> ToolResult:
     info = []
 
     # 1. Check terminal output for errors
-    terminals = webcontainer_state.get("terminals", [])
+    terminals = webcontainer_state.get("terminals") or ()
     for terminal in terminals:
-        history = terminal.get("history", [])
-        last_output = terminal.get("last_output", [])
-
-        # Combine outputs
-        all_output = []
-        for entry in history[-30:]:  # Check last 30 entries
-            if isinstance(entry, dict):
-                all_output.append(entry.get("data", ""))
-            else:
-                all_output.append(str(entry))
-        all_output.extend(last_output[-20:] if last_output else [])
-
-        output_text = "\n".join(all_output).lower()
-
-        # Check for common error patterns
-        error_patterns = [
-            ("error:", "Build/compile error"),
-            ("syntaxerror", "Syntax error"),
-            ("typeerror", "Type error"),
-            ("referenceerror", "Reference error (undefined variable)"),
-            ("cannot find module", "Missing module/import"),
-            ("module not found", "Module not found"),
-            ("failed to compile", "Compilation failed"),
-            ("enoent", "File not found"),
-            ("permission denied", "Permission error"),
-            ("npm err!", "NPM error"),
-            ("error: expected", "Parse error"),
+        # Check for common error patterns, reporting the first line that
+        # contains the highest-priority one
+        error_lines = [
+            line for line in _iter_recent_output(terminal)
+            if _TERMINAL_ERROR_RE.search(line)
         ]
-
-        for pattern, desc in error_patterns:
-            if pattern in output_text:
-                # Extract relevant error lines
-                error_lines = []
-                for line in all_output:
-                    if pattern in line.lower():
-                        error_lines.append(line.strip())
-                if error_lines:
-                    issues_found.append(f"🔴 {desc} in terminal:\n   {error_lines[0][:200]}")
-                break
+        if error_lines:
+            lowered = [line.lower() for line in error_lines]
+            for pattern, desc in _TERMINAL_ERROR_PATTERNS:
+                line = next((l for l, low in zip(error_lines, lowered) if pattern in low), None)
+                if line is not None:
+                    issues_found.append(f"🔴 {desc} in terminal:\n   {line.strip()[:200]}")
+                    break
 
     # 2. Check preview for Vite build errors (error_overlay)
     preview = webcontainer_state.get("preview", {})
@@ -1735,13 +2125,13 @@ def verify_changes(webcontainer_state: Optional[dict] = None) -> ToolResult:
             # This is a Vite build error - very important!
             issues_found.append(f"🔴 BUILD ERROR (Vite): {overlay_msg[:300]}")
             if overlay_stack:
-                stack_lines = overlay_stack.split("\n")[:3]
+                stack_lines = islice(_iter_lines(overlay_stack), 3)
                 for line in stack_lines:
                     if line.strip():
                         issues_found.append(f"   {line.strip()[:150]}")
 
             # Add helpful hint for common errors
-            if "Failed to resolve import" in overlay_msg or "Cannot find module" in overlay_msg:
+            if any(hint in overlay_msg for hint in _IMPORT_HINTS):
                 issues_found.append("   💡 Hint: A file is importing something that doesn't exist.")
                 issues_found.append("   → Use file_exists() to check, then create the missing file or remove the import")
 
@@ -1750,23 +2140,22 @@ def verify_changes(webcontainer_state: Optional[dict] = None) -> ToolResult:
 
     error_count = 0
     warn_count = 0
-    for msg in console_messages[-20:]:  # Check last 20 messages
+    for msg in _console_tail(console_messages, 20):  # Check last 20 messages
         msg_type = msg.get("type", "log")
-        args = msg.get("args", [])
-        content = " ".join(str(arg) for arg in args)[:150]
 
         if msg_type == "error":
             error_count += 1
             if error_count <= 3:  # Show first 3 errors
+                content = _truncate_join(msg.get("args", []), 150)
                 stack = msg.get("stack", "")
-                stack_preview = stack.split("\n")[0] if stack else ""
+                stack_preview = stack.partition("\n")[0] if stack else ""
                 issues_found.append(f"🔴 Runtime error: {content}")
                 if stack_preview:
                     issues_found.append(f"   Stack: {stack_preview[:100]}")
         elif msg_type == "warn":
             warn_count += 1
             if warn_count <= 2:  # Show first 2 warnings
-                warnings.append(f"⚠️ Warning: {content}")
+                warnings.append(f"⚠️ Warning: {_truncate_join(msg.get('args', []), 150)}")
 
     if error_count > 3:
         issues_found.append(f"   ... and {error_count - 3} more errors")
@@ -1832,6 +2221,39 @@ def verify_changes(webcontainer_state: Optional[dict] = None) -> ToolResult:
 # Context Understanding Tools (New)
 # ============================================
 
+# Single-slot cache for get_webcontainer_state, which understand_user_context
+# re-renders on every call. Containers replaced wholesale on each frontend
+# update are compared by identity (plus length, and per-terminal history
+# length for output appended in place); scalars are compared by value.
+_webcontainer_state_cache: Optional[tuple] = None
+
+
+def _webcontainer_state_fingerprint(webcontainer_state: dict) -> tuple:
+    """Return (values, refs): the scalars get_webcontainer_state renders and the containers it reads"""
+    files = webcontainer_state.get("files") or ()
+    terminals = webcontainer_state.get("terminals") or ()
+    preview = webcontainer_state.get("preview") or {}
+    console_messages = preview.get("console_messages") or ()
+    action_results = webcontainer_state.get("action_results") or ()
+
+    values = [
+        webcontainer_state.get("status", "unknown"),
+        webcontainer_state.get("error"),
+        webcontainer_state.get("active_file"),
+        webcontainer_state.get("active_terminal_id"),
+        webcontainer_state.get("preview_url"),
+        len(files), len(terminals), len(console_messages), len(action_results),
+    ]
+    refs = [files, terminals, preview, console_messages, action_results]
+    for terminal in terminals:
+        history = terminal.get("history") or ()
+        values.append(len(history))
+        refs.append(terminal)
+        refs.append(history)
+
+    return tuple(values), refs
+
+
 def get_webcontainer_state(webcontainer_state: Optional[dict] = None) -> ToolResult:
     """
     Get complete WebContainer state for context understanding.
@@ -1861,6 +2283,16 @@ def get_webcontainer_state(webcontainer_state: Optional[dict] = None) -> ToolRes
             result="WebContainer state not available"
         )
 
+    global _webcontainer_state_cache
+    values, refs = _webcontainer_state_fingerprint(webcontainer_state)
+    cached = _webcontainer_state_cache
+    if (
+        cached is not None
+        and cached[0] == values
+        and all(a is b for a, b in zip(cached[1], refs))
+    ):
+        return cached[2]
+
     lines = ["# WebContainer Complete State\n"]
 
     # 1. System Status
@@ -1881,17 +2313,16 @@ def get_webcontainer_state(webcontainer_state: Optional[dict] = None) -> ToolRes
 
     # Show recent files
     if files:
-        file_list = sorted(files.keys())
         lines.append("\n### Recent Files:")
-        for f in file_list[:15]:
+        for f in heapq.nsmallest(15, files):
             marker = " ← (active)" if f == active_file else ""
             lines.append(f"  - {f}{marker}")
-        if len(file_list) > 15:
-            lines.append(f"  ... and {len(file_list) - 15} more files")
+        if len(files) > 15:
+            lines.append(f"  ... and {len(files) - 15} more files")
     lines.append("")
 
     # 3. Terminals
-    terminals = webcontainer_state.get("terminals", [])
+    terminals = webcontainer_state.get("terminals") or ()
     active_terminal_id = webcontainer_state.get("active_terminal_id")
     lines.append("## Terminal Sessions")
     lines.append(f"- Total Terminals: {len(terminals)}")
@@ -1920,11 +2351,11 @@ def get_webcontainer_state(webcontainer_state: Optional[dict] = None) -> ToolRes
                 last_outputs = []
                 for entry in history[-5:]:
                     if isinstance(entry, dict):
-                        data = entry.get("data", "")
+                        data = entry.get("data", "").strip()
                     else:
-                        data = str(entry)
-                    if data.strip():
-                        last_outputs.append(data.strip()[:80])
+                        data = str(entry).strip()
+                    if data:
+                        last_outputs.append(data[:80])
 
                 if last_outputs:
                     lines.append("  - Recent Output:")
@@ -1947,9 +2378,11 @@ def get_webcontainer_state(webcontainer_state: Optional[dict] = None) -> ToolRes
         lines.append(f"- Error Message: {error_msg}")
 
     console_msgs = preview.get("console_messages", [])
+    console_parts = _partition_console(console_msgs)
+    error_msgs = console_parts.get("error", ())
     if console_msgs:
-        error_count = sum(1 for m in console_msgs if m.get("type") == "error")
-        warn_count = sum(1 for m in console_msgs if m.get("type") == "warn")
+        error_count = len(error_msgs)
+        warn_count = len(console_parts.get("warn", ()))
         log_count = len(console_msgs) - error_count - warn_count
 
         lines.append(f"\n### Console Messages:")
@@ -1957,12 +2390,11 @@ def get_webcontainer_state(webcontainer_state: Optional[dict] = None) -> ToolRes
         lines.append(f"  - Warnings: {warn_count}")
         lines.append(f"  - Logs: {log_count}")
 
-        recent_errors = [m for m in console_msgs if m.get("type") == "error"][-3:]
+        recent_errors = error_msgs[-3:]
         if recent_errors:
             lines.append("\n  Recent Errors:")
             for msg in recent_errors:
-                args = msg.get("args", [])
-                content = " ".join(str(arg) for arg in args)[:100]
+                content = _truncate_join(msg.get("args", []), 100)
                 lines.append(f"    • {content}")
 
     viewport = preview.get("viewport", {})
@@ -2010,7 +2442,6 @@ def get_webcontainer_state(webcontainer_state: Optional[dict] = None) -> ToolRes
     if preview.get("has_error"):
         health_issues.append("Preview has errors")
 
-    error_msgs = [m for m in console_msgs if m.get("type") == "error"]
     if error_msgs:
         health_issues.append(f"{len(error_msgs)} console errors")
 
@@ -2027,10 +2458,12 @@ def get_webcontainer_state(webcontainer_state: Optional[dict] = None) -> ToolRes
     else:
         lines.append("### ✅ All Systems Healthy")
 
-    return ToolResult(
+    result = ToolResult(
         success=True,
         result="\n".join(lines)
     )
+    _webcontainer_state_cache = (values, refs, result)
+    return result
 
 
 def understand_user_context(
@@ -2089,13 +2522,7 @@ def understand_user_context(
         context_lines.append("📸 Taking screenshot of current preview...")
         context_lines.append("(Screenshot will be included in response)\n")
 
-        action = {
-            "type": "take_screenshot",
-            "payload": {
-                "selector": None,
-                "full_page": False
-            }
-        }
+        action = _action("take_screenshot", selector=None, full_page=False)
     elif include_screenshot and preview_url:
         context_lines.append("## Visual Preview")
         if preview.get("is_loading"):
@@ -2114,7 +2541,7 @@ def understand_user_context(
     if active_file:
         context_lines.append(f"- User is currently viewing: `{active_file}`")
 
-    terminals = webcontainer_state.get("terminals", [])
+    terminals = webcontainer_state.get("terminals") or ()
     running_terminals = [t for t in terminals if t.get("is_running")]
     if running_terminals:
         context_lines.append(f"- {len(running_terminals)} terminal(s) running processes")
@@ -2122,19 +2549,19 @@ def understand_user_context(
             cmd = t.get("command", "unknown")
             context_lines.append(f"  - Running: {cmd}")
 
+    # Detect the framework from package.json and file names only; file
+    # contents are not scanned
     files = webcontainer_state.get("files", {})
-    file_paths = list(files.keys())
-
-    has_react = any("react" in files.get(f, "").lower() for f in file_paths)
-    has_vite = any("vite" in f.lower() for f in file_paths)
-    has_package_json = "/package.json" in file_paths or "package.json" in file_paths
+    pkg_content = files.get("/package.json") or files.get("package.json", "")
+    try:
+        pkg = json.loads(pkg_content)
+        deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
+    except (ValueError, TypeError, AttributeError):
+        # Missing or malformed package.json: fall back to a text check
+        deps = pkg_content.lower()
 
-    if has_package_json:
-        pkg_content = files.get("/package.json") or files.get("package.json", "")
-        if "react" in pkg_content.lower():
-            has_react = True
-        if "vite" in pkg_content.lower():
-            has_vite = True
+    has_react = "react" in deps or any(f.endswith((".jsx", ".tsx")) for f in files)
+    has_vite = "vite" in deps or any("vite" in f.lower() for f in files)
 
     project_type = []
     if has_react:
@@ -2218,9 +2645,36 @@ def get_tool_definitions() -> List[dict]:
     Get tool definitions in Claude API format.
 
     Returns:
-        List of tool definition dicts
+        List of tool definition dicts (a fresh list over the shared,
+        build-once definitions)
     """
-    return [
+    return list(_tool_definitions())
+
+
+def get_tool_definition(name: str) -> Optional[dict]:
+    """Get one tool definition by name (None if unknown)"""
+    return _tool_definitions_by_name().get(name)
+
+
+@functools.cache
+def _tool_definitions_by_name() -> Dict[str, dict]:
+    """Map tool name -> definition, built once"""
+    return {definition["name"]: definition for definition in _tool_definitions()}
+
+
+# Shared by every tool that takes no arguments. Kept a plain dict so the
+# definitions stay JSON-serializable; nothing mutates tool schemas.
+_NO_INPUT_SCHEMA = {
+    "type": "object",
+    "properties": {},
+    "required": []
+}
+
+
+@functools.cache
+def _tool_definitions() -> tuple:
+    """Build the definitions once; they are static data"""
+    return (
         # ============================================
         # STATE QUERY TOOLS - File Reading
         # ============================================
@@ -2269,11 +2723,7 @@ def get_tool_definitions() -> List[dict]:
         {
             "name": "get_project_structure",
             "description": "Get the complete project file tree. Shows all files and directories in a tree format.",
-            "input_schema": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+            "input_schema": _NO_INPUT_SCHEMA
         },
         {
             "name": "search_in_file",
@@ -2384,11 +2834,7 @@ def get_tool_definitions() -> List[dict]:
         {
             "name": "list_terminals",
             "description": "List all terminal sessions with their status (running/idle).",
-            "input_schema": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+            "input_schema": _NO_INPUT_SCHEMA
         },
 
         # ============================================
@@ -2397,20 +2843,12 @@ def get_tool_definitions() -> List[dict]:
         {
             "name": "get_preview_status",
             "description": "Get the current status of the preview/dev server. Shows if the server is running and the preview URL.",
-            "input_schema": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+            "input_schema": _NO_INPUT_SCHEMA
         },
         {
             "name": "get_preview_errors",
             "description": "Get detailed error information from the preview iframe, including Vite build errors, runtime errors, and error overlay messages. Use this to quickly check what's broken in the preview. More focused than get_console_messages for error debugging.",
-            "input_schema": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+            "input_schema": _NO_INPUT_SCHEMA
         },
         {
             "name": "get_console_messages",
@@ -2570,20 +3008,12 @@ def get_tool_definitions() -> List[dict]:
         {
             "name": "start_dev_server",
             "description": "Start the development server (runs npm install + npm run dev). IMPORTANT: This is a LONG-RUNNING async operation that takes 10-30 seconds. DO NOT call multiple times - once is enough! After calling, the preview will automatically become available when the server is ready. You can check get_terminal_output to see progress.",
-            "input_schema": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+            "input_schema": _NO_INPUT_SCHEMA
         },
         {
             "name": "stop_server",
             "description": "Stop the running development server.",
-            "input_schema": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+            "input_schema": _NO_INPUT_SCHEMA
         },
         {
             "name": "create_terminal",
@@ -2688,11 +3118,7 @@ def get_tool_definitions() -> List[dict]:
         {
             "name": "clear_console",
             "description": "Clear all console messages from the preview.",
-            "input_schema": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+            "input_schema": _NO_INPUT_SCHEMA
         },
 
         # ============================================
@@ -2721,11 +3147,7 @@ ALWAYS call verify_changes after:
 
 If errors are found, the tool provides specific guidance on how to fix them.
 If verify_changes returns "All Clear" but you know you made changes, call get_terminal_output to check for recent errors.""",
-            "input_schema": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+            "input_schema": _NO_INPUT_SCHEMA
         },
 
         # ============================================
@@ -2749,11 +3171,7 @@ Use this tool when you need to:
 - Verify the state after making changes
 
 This is a READ-ONLY tool that provides a snapshot of the entire system state.""",
-            "input_schema": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+            "input_schema": _NO_INPUT_SCHEMA
         },
         {
             "name": "understand_user_context",
@@ -2797,4 +3215,4 @@ Returns:
                 "required": []
             }
         }
-    ]
+    )
@@ -24,9 +24,12 @@ Philosophy:
 """
 
 from __future__ import annotations
-from typing import Any, Optional, List, Dict
+from typing import Optional, List, Dict
+from collections import deque
 from dataclasses import dataclass, field
+import itertools
 import re
+import shlex
 import uuid
 import time
 import logging
@@ -38,7 +41,7 @@ logger = logging.getLogger(__name__)
 # Tool Result Types
 # ============================================
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     """Result from tool execution"""
     success: bool
@@ -50,7 +53,7 @@ class ToolResult:
     requires_confirmation: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionRequest:
     """
     Request for frontend action execution.
@@ -63,7 +66,7 @@ class ActionRequest:
     created_at: float = field(default_factory=time.time)
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionResult:
     """
     Result of frontend action execution.
@@ -81,6 +84,27 @@ class ActionResult:
 # Action Store (for tracking pending actions)
 # ============================================
 
+# Action ids are a random per-process prefix (so ids from before a restart
+# never match new actions) plus a process-wide counter: no randomness or
+# syscall per action, and unique across ActionStore instances
+_ACTION_ID_PREFIX = f"action-{uuid.uuid4().hex[:6]}"
+_action_counter = itertools.count()
+
+# Completed results kept for get_result(); older ones are evicted
+_MAX_RESULTS = 1024
+
+
+class _ActionSlot:
+    """Everything ActionStore tracks for one action id"""
+
+    __slots__ = ("request", "result", "event")
+
+    def __init__(self, request: Optional[ActionRequest] = None):
+        self.request = request  # Set while the action is pending
+        self.result: Optional[ActionResult] = None
+        self.event = None  # asyncio.Event, created by the first waiter
+
+
 class ActionStore:
     """
     Store for tracking pending actions and their results.
@@ -93,41 +117,55 @@ class ActionStore:
     """
 
     def __init__(self):
-        self._pending: Dict[str, ActionRequest] = {}
-        self._results: Dict[str, ActionResult] = {}
-        self._waiters: Dict[str, Any] = {}  # asyncio.Future objects
+        # One slot per action id: request, result and waiter event together
+        self._slots: Dict[str, _ActionSlot] = {}
+        # Ids of slots holding a result, oldest completion first
+        self._completed: deque = deque()
 
     def create_action(self, action_type: str, payload: dict) -> ActionRequest:
         """Create a new action request"""
-        action_id = f"action-{uuid.uuid4().hex[:12]}"
+        action_id = f"{_ACTION_ID_PREFIX}{next(_action_counter):06x}"
         action = ActionRequest(
             id=action_id,
             type=action_type,
             payload=payload
         )
-        self._pending[action_id] = action
-        logger.info(f"[ActionStore] Created action {action_id}: {action_type}")
+        self._slots[action_id] = _ActionSlot(action)
+        logger.info("[ActionStore] Created action %s: %s", action_id, action_type)
         return action
 
     def set_result(self, action_id: str, result: ActionResult):
         """Set result for an action (called when frontend reports back)"""
-        self._results[action_id] = result
-        # Remove from pending
-        self._pending.pop(action_id, None)
-        # Wake up any waiters
-        if action_id in self._waiters:
-            future = self._waiters.pop(action_id)
-            if not future.done():
-                future.set_result(result)
-        logger.info(f"[ActionStore] Result received for {action_id}: success={result.success}")
+        slot = self._slots.get(action_id)
+        if slot is None:
+            slot = self._slots[action_id] = _ActionSlot()
+        elif slot.result is not None:
+            # Late duplicate (e.g. a frontend retry): the first result stands
+            logger.debug("[ActionStore] Ignoring duplicate result for %s", action_id)
+            return
+        slot.result = result
+        # No longer pending
+        slot.request = None
+        # Wake up any waiters (they read the result from the slot)
+        event, slot.event = slot.event, None
+        if event is not None:
+            event.set()
+        # Bound memory: forget the oldest results beyond _MAX_RESULTS
+        completed = self._completed
+        completed.append(action_id)
+        if len(completed) > _MAX_RESULTS:
+            self._slots.pop(completed.popleft(), None)
+        logger.info("[ActionStore] Result received for %s: success=%s", action_id, result.success)
 
     def get_result(self, action_id: str) -> Optional[ActionResult]:
         """Get result for an action (non-blocking)"""
-        return self._results.get(action_id)
+        slot = self._slots.get(action_id)
+        return slot.result if slot is not None else None
 
     def is_pending(self, action_id: str) -> bool:
         """Check if action is still pending"""
-        return action_id in self._pending
+        slot = self._slots.get(action_id)
+        return slot is not None and slot.request is not None
 
     async def wait_for_result(self, action_id: str, timeout: float = 30.0) -> Optional[ActionResult]:
         """
@@ -138,22 +176,31 @@ class ActionStore:
         import asyncio
 
         # Check if already have result
-        if action_id in self._results:
-            return self._results[action_id]
+        slot = self._slots.get(action_id)
+        if slot is None:
+            slot = self._slots[action_id] = _ActionSlot()
+        elif slot.result is not None:
+            return slot.result
 
-        # Create future to wait on
-        loop = asyncio.get_event_loop()
-        future = loop.create_future()
-        self._waiters[action_id] = future
+        # Wait for set_result to signal; concurrent waiters share one event
+        if slot.event is None:
+            slot.event = asyncio.Event()
+        event = slot.event
 
         try:
-            result = await asyncio.wait_for(future, timeout=timeout)
-            return result
+            if hasattr(asyncio, "timeout"):
+                # Python 3.11+: a timer on this task, no wrapper task
+                async with asyncio.timeout(timeout):
+                    await event.wait()
+            else:
+                await asyncio.wait_for(event.wait(), timeout=timeout)
         except asyncio.TimeoutError:
-            logger.warning(f"[ActionStore] Timeout waiting for action {action_id}")
-            self._waiters.pop(action_id, None)
-            self._pending.pop(action_id, None)
+            logger.warning("[ActionStore] Timeout waiting for action %s", action_id)
+            # Drop the waiter and the pending request; nothing else to keep
+            if slot.result is None and self._slots.get(action_id) is slot:
+                del self._slots[action_id]
             return None
+        return slot.result
 
 
 # Global action store instance
@@ -168,6 +215,18 @@ def get_action_store() -> ActionStore:
 # Core Tools - Claude Code Style
 # ============================================
 
+def _split_command(command: str) -> List[str]:
+    """Split a command into program and args, honoring shell quoting"""
+    if "'" not in command and '"' not in command and "\\" not in command:
+        # Common case (npm install, ls -la): nothing for shlex to do
+        return command.split()
+    try:
+        return shlex.split(command)
+    except ValueError:
+        # Unbalanced quotes; the frontend runs raw_command anyway
+        return command.split()
+
+
 def shell(command: str, background: bool = False) -> ToolResult:
     """
     Execute a shell command in the WebContainer.
@@ -202,7 +261,7 @@ def shell(command: str, background: bool = False) -> ToolResult:
         ToolResult with command output and exit status
     """
     # Parse command into program and args
-    parts = command.strip().split()
+    parts = _split_command(command)
     if not parts:
         return ToolResult(
             success=False,
@@ -245,6 +304,59 @@ def shell(command: str, background: bool = False) -> ToolResult:
     )
 
 
+def shell_batch(commands: List[str]) -> ToolResult:
+    """
+    Execute several shell commands in the WebContainer as one action.
+
+    The commands run in order and stop at the first failure (joined with
+    "&&"), so a scaffolding sequence costs a single confirmation round-trip
+    instead of one per command.
+
+    Examples:
+        shell_batch(["mkdir -p src/components", "npm install react-router-dom"])
+
+    Args:
+        commands: Shell commands to execute, in order
+
+    Returns:
+        ToolResult with the combined command output and exit status
+    """
+    commands = [command.strip() for command in commands if command and command.strip()]
+    if not commands:
+        return ToolResult(
+            success=False,
+            result="Error: No commands to execute"
+        )
+    if len(commands) == 1:
+        return shell(commands[0])
+
+    # The frontend runs "&&" chains through jsh, so the batch is an
+    # ordinary shell action
+    raw_command = " && ".join(commands)
+    parts = _split_command(raw_command)
+
+    action = {
+        "type": "shell",
+        "payload": {
+            "command": parts[0],
+            "args": parts[1:],
+            "raw_command": raw_command,
+            "background": False,
+            "commands": commands
+        }
+    }
+
+    action_request = _action_store.create_action("shell", action["payload"])
+
+    return ToolResult(
+        success=True,
+        result=f"Executing {len(commands)} commands: {raw_command}",
+        action=action,
+        action_id=action_request.id,
+        requires_confirmation=True
+    )
+
+
 def write_file(path: str, content: str) -> ToolResult:
     """
     Write content to a file. Creates the file if it doesn't exist.
@@ -1065,6 +1177,7 @@ STATE_TOOLS = {
 # Action tools (require frontend execution)
 ACTION_TOOLS = {
     "shell": shell,
+    "shell_batch": shell_batch,
     "write_file": write_file,
     "edit_file": edit_file,
     "delete_file": delete_file,
@@ -1132,6 +1245,30 @@ When to use:
                 "required": ["command"]
             }
         },
+        {
+            "name": "shell_batch",
+            "description": """Execute several shell commands in order as ONE action.
+
+Prefer this over consecutive shell() calls when you already know the
+whole sequence - it needs a single round-trip instead of one per command.
+Execution stops at the first failing command.
+
+Example:
+  shell_batch(["mkdir -p src/components", "npm install react-router-dom"])
+
+Do NOT use for long-running commands (dev server) - use shell(..., background=True).""",
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "commands": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Shell commands to execute, in order"
+                    }
+                },
+                "required": ["commands"]
+            }
+        },
 
         # ============================================
         # FILE OPERATIONS
@@ -25,6 +25,25 @@ from fastapi import WebSocket, WebSocketDisconnect
 logger = logging.getLogger(__name__)
 
 
+# ============================================
+# Helpers
+# ============================================
+
+def _canonicalize_file_keys(files: Dict[str, str]) -> Dict[str, str]:
+    """
+    Give every file key a leading slash ("src/App.jsx" -> "/src/App.jsx").
+
+    Done once at state ingestion so file tools can rely on a single
+    canonical key form and do one dict lookup per path.
+    """
+    if all(path.startswith("/") for path in files):
+        return files
+    return {
+        (path if path.startswith("/") else f"/{path}"): content
+        for path, content in files.items()
+    }
+
+
 # ============================================
 # Message Types
 # ============================================
@@ -640,7 +659,7 @@ class WebSocketManager:
 
         # Update state fields
         session.webcontainer_state.status = state.get("status", "idle")
-        session.webcontainer_state.files = state.get("files", {})
+        session.webcontainer_state.files = _canonicalize_file_keys(state.get("files", {}))
         session.webcontainer_state.active_file = state.get("active_file")
         session.webcontainer_state.terminals = state.get("terminals", [])
         session.webcontainer_state.preview_url = state.get("preview_url")
@@ -13,7 +13,7 @@ import logging
 from typing import Dict, Any, List, Optional, TYPE_CHECKING
 
 # Import tool definitions from original agent (same tools, different execution)
-from agent.mcp_tools import TOOL_DEFINITIONS
+from agent.mcp_tools import TOOL_DEFINITIONS, TOOL_DEFINITIONS_BY_NAME
 
 from .boxlite_mcp_executor import BoxLiteMCPExecutor
 
@@ -60,9 +60,7 @@ class BoxLiteMCPServer:
         )
 
         # Tool registry (same tools as WebContainer)
-        self._tools: Dict[str, Dict[str, Any]] = {
-            tool["name"]: tool for tool in TOOL_DEFINITIONS
-        }
+        self._tools: Dict[str, Dict[str, Any]] = TOOL_DEFINITIONS_BY_NAME
 
         logger.info(
             f"BoxLiteMCPServer initialized: "
@@ -0,0 +1,77 @@
+"""
+工具注册表测试
+
+tool_registry 通过 _TOOL_MODULES 延迟加载工具函数。这个映射是手工维护的，
+这里检查它和各子模块自己的 *_TOOLS 注册表保持一致：子模块新增工具后
+如果忘记登记，测试会失败。
+
+运行测试：
+    cd backend
+    pytest tests/test_tool_registry.py -v
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+# 确保可以导入 agent 模块
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agent.tools import tool_registry
+
+
+# 子模块 -> 该子模块的工具注册表
+SUBMODULE_REGISTRIES = {
+    ".webcontainer_tools": "ALL_TOOLS",
+    ".claude_code_tools": "CLAUDE_CODE_TOOLS",
+    ".todo_tools": "TODO_TOOLS",
+    ".task_tool": "TASK_TOOLS",
+    ".network_tools": "NETWORK_TOOLS",
+    ".terminal_preview_reader_tools": "TERMINAL_PREVIEW_READER_TOOLS",
+    ".preview_diagnostic_tools": "PREVIEW_DIAGNOSTIC_TOOLS",
+    ".self_healing_tools": "SELF_HEALING_TOOLS",
+    ".error_handling_tools": "ERROR_HANDLING_TOOLS",
+}
+
+# 子模块注册表中有意不进入统一注册表的工具（由 agent.tools 单独合并）
+NOT_IN_REGISTRY = {
+    "get_preview_errors",
+    "get_webcontainer_state",
+    "read_lines",
+    "understand_user_context",
+}
+
+
+def _submodule_registry(module_name):
+    module = importlib.import_module(module_name, tool_registry.__package__)
+    return module, getattr(module, SUBMODULE_REGISTRIES[module_name])
+
+
+def test_tool_modules_match_categories():
+    """测试：_TOOL_MODULES 与 TOOL_CATEGORIES 中的工具完全一致"""
+    category_tools = {
+        tool for tools in tool_registry.TOOL_CATEGORIES.values() for tool in tools
+    }
+
+    assert set(tool_registry._TOOL_MODULES) == category_tools
+
+
+def test_tool_modules_cover_submodule_registries():
+    """测试：子模块注册表中的每个工具都登记在 _TOOL_MODULES 中"""
+    for module_name in SUBMODULE_REGISTRIES:
+        _, registry = _submodule_registry(module_name)
+        for tool in registry:
+            if tool in NOT_IN_REGISTRY:
+                continue
+            assert tool_registry._TOOL_MODULES.get(tool) == module_name, tool
+
+
+@pytest.mark.parametrize("tool", sorted(tool_registry._TOOL_MODULES))
+def test_tool_modules_resolve_to_registered_function(tool):
+    """测试：_TOOL_MODULES 指向的子模块确实注册了该工具函数"""
+    module, registry = _submodule_registry(tool_registry._TOOL_MODULES[tool])
+
+    assert registry[tool] is getattr(module, tool)
+    assert tool_registry.get_tool_by_name(tool) is registry[tool]
@@ -0,0 +1,120 @@
+"""
+WebContainer 工具测试
+
+这个文件测试 WebContainer 状态查询工具（纯函数，不需要 sandbox）。
+
+运行测试：
+    cd backend
+    pytest tests/test_webcontainer_tools.py -v
+"""
+
+import pytest
+import re
+import sys
+from pathlib import Path
+
+# 确保可以导入 agent 模块
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agent.tools.webcontainer_tools import search_in_file, search_in_project
+
+
+# 第二行同时出现在行首和行尾，用于检查行边界相关的正则
+CONTENT = "x\nfoo here\nbar"
+STATE = {"files": {"/src/app.js": CONTENT}}
+
+# 逐行匹配时这些模式都能命中第 2 行
+LINE_BOUNDARY_PATTERNS = [r"\Afoo", r"here\Z", r"(?<!\s)foo", r"here(?!\s)"]
+
+# 不回溯的结构（原子组、占有量词、前瞻捕获）会吞掉换行且不再退回，
+# 结果必须与逐行 re.search 一致
+NO_BACKTRACK_CONTENT = "ac\nxb"
+NO_BACKTRACK_STATE = {"files": {"/a.txt": NO_BACKTRACK_CONTENT}}
+NO_BACKTRACK_PATTERNS = [
+    r"a[^b]*+$",
+    r"a[^b]++$",
+    r"a[^b]{0,5}+$",
+    r"a(?>[^b]*)$",
+    r"(?=(a[^b]*))\1$",
+]
+
+
+def _per_line_matches(pattern, content):
+    """逐行 re.search 的结果：[(行号, 行内容), ...]"""
+    regex = re.compile(pattern, re.IGNORECASE)
+    return [
+        (line_no, line)
+        for line_no, line in enumerate(content.split("\n"), 1)
+        if regex.search(line)
+    ]
+
+
+# ============================================
+# search_in_file 测试
+# ============================================
+
+class TestSearchInFile:
+    """文件内搜索工具测试"""
+
+    def test_search_in_file_found(self):
+        """测试：找到匹配"""
+        result = search_in_file("/src/app.js", "foo", webcontainer_state=STATE)
+
+        assert result.success
+        assert "foo here" in result.result
+
+    @pytest.mark.parametrize("pattern", LINE_BOUNDARY_PATTERNS)
+    def test_search_in_file_line_boundary_patterns(self, pattern):
+        """测试：\\A、\\Z 和前后断言按单行匹配"""
+        result = search_in_file("/src/app.js", pattern, webcontainer_state=STATE)
+
+        assert result.success
+        assert "No matches" not in result.result
+        assert "foo here" in result.result
+
+    @pytest.mark.parametrize("pattern", NO_BACKTRACK_PATTERNS)
+    def test_search_in_file_no_backtrack_patterns(self, pattern):
+        """测试：原子组和占有量词与逐行 re.search 结果一致"""
+        expected = _per_line_matches(pattern, NO_BACKTRACK_CONTENT)
+        result = search_in_file("/a.txt", pattern, webcontainer_state=NO_BACKTRACK_STATE)
+
+        assert result.success
+        assert expected
+        assert f"Found {len(expected)} matches" in result.result
+        for line_no, line in expected:
+            assert f"L{line_no}: {line}" in result.result
+
+
+# ============================================
+# search_in_project 测试
+# ============================================
+
+class TestSearchInProject:
+    """项目搜索工具测试"""
+
+    def test_search_in_project_found(self):
+        """测试：找到匹配"""
+        result = search_in_project("foo", "*", STATE)
+
+        assert result.success
+        assert "L2: foo here" in result.result
+
+    @pytest.mark.parametrize("pattern", LINE_BOUNDARY_PATTERNS)
+    def test_search_in_project_line_boundary_patterns(self, pattern):
+        """测试：\\A、\\Z 和前后断言按单行匹配"""
+        result = search_in_project(pattern, "*", STATE)
+
+        assert result.success
+        assert "L2: foo here" in result.result
+
+    @pytest.mark.parametrize("pattern", NO_BACKTRACK_PATTERNS)
+    def test_search_in_project_no_backtrack_patterns(self, pattern):
+        """测试：原子组和占有量词与逐行 re.search 结果一致"""
+        expected = _per_line_matches(pattern, NO_BACKTRACK_CONTENT)
+        result = search_in_project(pattern, "*", NO_BACKTRACK_STATE)
+
+        assert result.success
+        assert expected
+        assert f"Found {len(expected)} matches" in result.result
+        for line_no, line in expected:
+            assert f"L{line_no}: {line}" in result.result